@@ -0,0 +1,151 @@
+from datetime import date
+from operator import itemgetter
+import numpy as np
+import database
+from money import Money
+
+ROLLING_MONTHS = 3
+FORECAST_MONTHS = 12     # Complete months the trend line is fitted to
+OUTLIER_SCORE = 3.5      # Modified z-score above which an expense counts as unusual
+MIN_CATEGORY_SIZE = 8    # Categories with fewer expenses are never flagged
+MAX_OUTLIERS = 20
+
+
+class ExpenseColumns:
+    """A user's expenses as parallel NumPy arrays instead of one tuple per row.
+
+    `cents` holds exact centavo amounts and `codes` an index into `types`, so
+    every statistic is a whole-array operation. `rows` keeps the original tuples
+    for the few rows a result points back to.
+    """
+
+    def __init__(self, rows):
+        count = len(rows)
+        codes_by_type = {}
+        self.rows = rows
+        self.codes = np.fromiter(
+            (codes_by_type.setdefault(expense_type, len(codes_by_type)) for expense_type in map(itemgetter(1), rows)),
+            np.int64, count
+        )
+        self.types = list(codes_by_type)
+        self.cents = np.fromiter((amount.cents for amount in map(itemgetter(2), rows)), np.int64, count)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def load_expense_columns(user_id, rows=None):
+    """Builds ExpenseColumns from already loaded rows, or streams the user's history."""
+    if rows is None:
+        rows = [row for chunk in database.stream_user_expenses(user_id) for row in chunk]
+    return ExpenseColumns(rows)
+
+
+def analyze_summary(summary, today=None):
+    """Returns the dashboard's spending trends from a database.fetch_summary() result.
+
+    Only the daily rollup's per-month and per-category totals are read, so the
+    cost follows the number of months and categories, not of expenses.
+    "months": (year, month, total, rolling average) newest first,
+    "shares": (expense_type, share, total) largest first,
+    "forecast": (year, month, forecast, spent so far) for the current month, or None.
+    Amounts come back as Money.
+    """
+    by_month = summary["by_month"]
+    if not by_month:
+        return {"months": [], "shares": [], "forecast": None}
+
+    today = today or date.today()
+    current = (today.year - 1970) * 12 + today.month - 1
+    indexes = np.array([(year - 1970) * 12 + month - 1 for year, month, _ in by_month], np.int64)
+    first = min(int(indexes.min()), current)
+    last = max(int(indexes.max()), current)
+
+    totals = np.zeros(last - first + 1, np.int64)
+    totals[indexes - first] = [total.cents for _, _, total in by_month]
+    return {
+        "months": _monthly(totals, first, current),
+        "shares": _shares(summary["by_type"]),
+        "forecast": _forecast(totals, first, current)
+    }
+
+
+def user_outliers(user_id, rows=None):
+    """Runs find_outliers() over a user's whole history. Meant for a worker thread."""
+    return find_outliers(load_expense_columns(user_id, rows))
+
+
+# **Statistics**
+def _month_label(index):
+    return 1970 + index // 12, index % 12 + 1
+
+
+def _monthly(totals, first, current):
+    """Per-month totals with a trailing ROLLING_MONTHS average, from one cumulative sum."""
+    running = np.concatenate(([0], np.cumsum(totals)))
+    end = np.arange(1, len(totals) + 1)
+    start = np.maximum(end - ROLLING_MONTHS, 0)
+    rolling = np.rint((running[end] - running[start]) / (end - start)).astype(np.int64)
+
+    shown = np.arange(min(len(totals), current - first + 1))[::-1]  # Up to the current month, newest first
+    return [
+        _month_label(first + int(i)) + (Money(int(totals[i])), Money(int(rolling[i])))
+        for i in shown
+    ]
+
+
+def _shares(by_type):
+    grand_total = sum(total.cents for _, total, _ in by_type)
+    return [
+        (expense_type, total.cents / grand_total if grand_total else 0.0, total)
+        for expense_type, total, _ in by_type
+    ]
+
+
+def _forecast(totals, first, current):
+    """Extends a least-squares line through the last FORECAST_MONTHS complete months."""
+    offset = current - first
+    history = totals[max(offset - FORECAST_MONTHS, 0):offset]
+    if not len(history):
+        return None
+    if len(history) < 3:
+        estimate = history.mean()
+    else:
+        slope, intercept = np.polyfit(np.arange(len(history)), history, 1)
+        estimate = slope * len(history) + intercept
+    spent = int(totals[offset])
+    # The month can't end below what has already been spent
+    return _month_label(current) + (Money(max(int(round(estimate)), spent)), Money(spent))
+
+
+def _group_median_sums(values, codes, starts, counts):
+    """Twice the median of integer `values` within each code group, kept exact as an integer.
+
+    Offsetting each group by `span` lets one plain sort order every group at once.
+    """
+    low = int(values.min())
+    span = int(values.max()) - low + 1
+    offsets = np.arange(len(counts), dtype=np.int64) * span
+    ordered = np.sort(offsets[codes] + (values - low)) - np.repeat(offsets, counts) + low
+    return ordered[starts + (counts - 1) // 2] + ordered[starts + counts // 2]
+
+
+def find_outliers(columns):
+    """Returns unusually large expenses as (id, expense_type, amount, created_at, score), most unusual first.
+
+    Scores are a per-category modified z-score (median and MAD).
+    """
+    if not len(columns):
+        return []
+    codes = columns.codes
+    counts = np.bincount(codes, minlength=len(columns.types))
+    starts = np.cumsum(counts) - counts
+
+    # Working in doubled units keeps the medians of centavo amounts whole numbers
+    deviations = 2 * columns.cents - _group_median_sums(columns.cents, codes, starts, counts)[codes]
+    mads = _group_median_sums(np.abs(deviations), codes, starts, counts)[codes] / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = 0.6745 * deviations / mads
+    flagged = np.flatnonzero((counts[codes] >= MIN_CATEGORY_SIZE) & (mads > 0) & (scores > OUTLIER_SCORE))
+    flagged = flagged[np.argsort(-scores[flagged], kind="stable")][:MAX_OUTLIERS]
+    return [tuple(columns.rows[i]) + (float(scores[i]),) for i in flagged]
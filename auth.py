@@ -0,0 +1,46 @@
+import os
+import database
+
+# **Password Hashing Settings**
+# Work factor for new hashes; raise it on fast machines, lower it on slow kiosks.
+BCRYPT_ROUNDS = int(os.environ.get("EXPENSE_TRACKER_BCRYPT_ROUNDS", "12"))
+
+
+def hash_password(password, rounds=None):
+    """Hashes a password with the configured bcrypt work factor."""
+    import bcrypt  # Deferred: only the login/registration workers need it
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds or BCRYPT_ROUNDS)).decode()
+
+
+def hash_rounds(hashed_password):
+    """Reads the work factor out of a '$2b$12$...' bcrypt hash."""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def authenticate(username, password):
+    """Returns the user's id when the password matches, otherwise None.
+
+    Meant to run on a worker thread. A hash stored with a different work factor
+    is replaced after a successful check, so changing BCRYPT_ROUNDS migrates
+    users as they log in.
+    """
+    import bcrypt
+    user = database.get_user_credentials(username)
+    if not user:
+        return None
+
+    user_id, stored_hash = user
+    if not bcrypt.checkpw(password.encode(), stored_hash.encode()):
+        return None
+
+    if hash_rounds(stored_hash) != BCRYPT_ROUNDS:
+        database.update_password_hash(user_id, hash_password(password))
+    return user_id
+
+
+def register_user(username, email, password):
+    """Hashes the password and stores the new user; meant to run on a worker thread."""
+    return database.create_user(username, email, hash_password(password))
@@ -0,0 +1,260 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from money import Money
+
+SQLITE_SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sqlite_schema.sql")
+SQLITE_SCHEMA_VERSION = 2  # Stored in PRAGMA user_version
+
+
+class MySQLBackend:
+    """Pooled MySQL/MariaDB storage (the schema in expense_tracker.sql)."""
+
+    name = "mysql"
+    lock_clause = " FOR UPDATE"
+
+    def __init__(self, config, pool_name="expense_tracker_pool", pool_size=5):
+        self.config = config
+        self.pool_name = pool_name
+        self.pool_size = pool_size
+        self._pool = None
+
+    def _get_pool(self):
+        """Creates the connection pool on first use (importing the driver only then)."""
+        if self._pool is None:
+            from mysql.connector import pooling
+            self._pool = pooling.MySQLConnectionPool(
+                pool_name=self.pool_name,
+                pool_size=self.pool_size,
+                pool_reset_session=True,
+                **self.config
+            )
+        return self._pool
+
+    @contextmanager
+    def connection(self):
+        """Borrows a connection from the pool and hands it back when done."""
+        connection = self._get_pool().get_connection()
+        try:
+            # **Health Check** - revives connections the server dropped while idle
+            connection.ping(reconnect=True, attempts=3, delay=1)
+            yield connection
+        finally:
+            connection.close()  # Returns the connection to the pool
+
+    def cursor(self, connection, prepared=True, buffered=True):
+        if prepared:
+            return _MySQLCursor(connection.cursor(prepared=True))
+        return _MySQLCursor(connection.cursor(buffered=buffered))
+
+    def begin(self, connection):
+        """Autocommit is off, so the first statement opens the transaction."""
+
+    def discard_results(self, connection):
+        """Drains rows an abandoned unbuffered cursor left on the wire."""
+        connection.consume_results()
+
+    def is_rejection(self, error):
+        """Returns True when the server refused the data itself, so sending it again can't succeed."""
+        from mysql.connector import errors
+        return isinstance(error, (errors.DataError, errors.IntegrityError))
+
+    # **Dialect**
+    def upsert_increment(self, table, columns, key_columns, increment_columns):
+        placeholders = ", ".join(["%s"] * len(columns))
+        updates = ", ".join(f"{column} = {column} + VALUES({column})" for column in increment_columns)
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+
+    def year(self, column):
+        return f"YEAR({column})"
+
+    def month(self, column):
+        return f"MONTH({column})"
+
+    def money(self, value):
+        """Reads a DECIMAL(…,2) amount or total."""
+        return None if value is None else Money.from_decimal(value)
+
+
+class _MySQLCursor:
+    """Hands Money parameters to the connector as exact DECIMAL values."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=()):
+        self._cursor.execute(query, _decimal_params(params))
+
+    def executemany(self, query, seq_of_params):
+        self._cursor.executemany(query, [_decimal_params(params) for params in seq_of_params])
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)  # fetchone, fetchall, fetchmany, lastrowid, close
+
+
+def _decimal_params(params):
+    return tuple(value.to_decimal() if isinstance(value, Money) else value for value in params)
+
+
+class _SQLiteCursor:
+    """Lets the shared '%s'-style queries run on sqlite3's '?' placeholders."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=()):
+        self._cursor.execute(query.replace("%s", "?"), params)
+
+    def executemany(self, query, seq_of_params):
+        self._cursor.executemany(query.replace("%s", "?"), seq_of_params)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+def _sql_statements(lines):
+    """Splits a schema script into statements (executescript() would commit the open transaction)."""
+    statement = ""
+    for line in lines:
+        if line.lstrip().startswith("--"):
+            continue
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement.strip()
+            statement = ""
+
+
+class SQLiteBackend:
+    """Embedded single-file storage for offline and single-user installs.
+
+    Uses WAL so the GUI's background readers do not block on a writer. sqlite3
+    connections are tied to their thread, so each worker thread keeps its own.
+    """
+
+    name = "sqlite"
+    lock_clause = ""  # BEGIN IMMEDIATE already holds the write lock
+
+    def __init__(self, path, pool_size=5):
+        self.path = path
+        self.pool_size = pool_size  # Worker threads, and so connections, open at once
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        sqlite3.register_adapter(Decimal, str)
+        sqlite3.register_adapter(Money, lambda value: value.cents)  # Amounts are INTEGER centavos
+        sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+        sqlite3.register_adapter(date, lambda value: value.isoformat())
+        sqlite3.register_converter("timestamp", lambda value: datetime.fromisoformat(value.decode()))
+        sqlite3.register_converter("date", lambda value: date.fromisoformat(value.decode()))
+
+    def _connect(self):
+        connection = sqlite3.connect(
+            self.path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None  # Transactions are opened explicitly in begin()
+        )
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.execute("PRAGMA busy_timeout = 5000")
+        with self._schema_lock:
+            if not self._schema_ready:
+                self._apply_schema(connection)
+                self._schema_ready = True
+        return connection
+
+    def _apply_schema(self, connection):
+        """Creates missing tables and upgrades files written by older versions.
+
+        Everything, including the new user_version, commits in one write
+        transaction, so a crash can't leave a step applied but unrecorded and a
+        second app instance opening the same file waits, then finds it current.
+        """
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            existing = connection.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'expenses'").fetchone()[0]
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            with open(SQLITE_SCHEMA, encoding="utf-8") as schema_file:
+                for statement in _sql_statements(schema_file):
+                    connection.execute(statement)
+
+            if existing and version < 1:
+                # Version 1: amounts became INTEGER centavos (they were stored as REAL pesos)
+                columns = [row[1] for row in connection.execute("PRAGMA table_info(users)")]
+                if "expense_version" not in columns:
+                    connection.execute("ALTER TABLE users ADD expense_version int(11) NOT NULL DEFAULT 0")
+                columns = [row[1] for row in connection.execute("PRAGMA table_info(expenses)")]
+                if "client_key" not in columns:
+                    # ALTER TABLE can't add a UNIQUE column, so the constraint comes as an index
+                    connection.execute("ALTER TABLE expenses ADD client_key char(32) DEFAULT NULL")
+                    connection.execute("CREATE UNIQUE INDEX client_key ON expenses (client_key)")
+                connection.execute("UPDATE expenses SET amount = CAST(ROUND(amount * 100) AS INTEGER)")
+                connection.execute("UPDATE expense_daily_rollup SET total = CAST(ROUND(total * 100) AS INTEGER)")
+            if existing and version < 2:
+                # Version 2: `user_created_at` lost the `amount` suffix that kept it from serving keyset order
+                connection.execute("DROP INDEX IF EXISTS user_created_at")
+                connection.execute("CREATE INDEX user_created_at ON expenses (user_id, created_at)")
+            connection.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")  # Transactional in SQLite
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    @contextmanager
+    def connection(self):
+        """Yields this thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        yield connection
+
+    def cursor(self, connection, prepared=True, buffered=True):
+        return _SQLiteCursor(connection.cursor())
+
+    def begin(self, connection):
+        connection.execute("BEGIN IMMEDIATE")
+
+    def discard_results(self, connection):
+        """sqlite3 cursors hold no server-side state to drain."""
+
+    def is_rejection(self, error):
+        """Returns True when the database refused the data itself, so sending it again can't succeed."""
+        return isinstance(error, (sqlite3.DataError, sqlite3.IntegrityError))
+
+    # **Dialect**
+    def upsert_increment(self, table, columns, key_columns, increment_columns):
+        placeholders = ", ".join(["%s"] * len(columns))
+        updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in increment_columns)
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}"
+        )
+
+    def year(self, column):
+        return f"CAST(strftime('%Y', {column}) AS INTEGER)"
+
+    def month(self, column):
+        return f"CAST(strftime('%m', {column}) AS INTEGER)"
+
+    def money(self, value):
+        """Reads an INTEGER centavo amount or total."""
+        return None if value is None else Money(int(value))
@@ -0,0 +1,105 @@
+"""Cold-start benchmark: time from launching Python to the first paint of LandingPage.
+
+    python benchmark_startup.py                    # compare against startup_baseline.json
+    python benchmark_startup.py --update-baseline  # record the current machine's baseline
+
+Each run is a fresh interpreter, so nothing is warm in sys.modules. The script
+exits non-zero when the median is more than --tolerance slower than the baseline,
+when there is no baseline to compare against, or when a module that should load
+lazily was already imported at first paint. Baselines are per machine, so
+startup_baseline.json is not committed.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "startup_baseline.json")
+
+# Nothing on this list is needed to draw the landing page
+LAZY_MODULES = ["mysql", "bcrypt", "pyarrow", "numpy", "login", "register", "dashboard", "about", "guide"]
+
+CHILD = """
+import sys, time, json
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, QEvent
+
+app = QApplication(sys.argv)
+from navigator import get_navigator
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            loaded = sorted(name for name in %(lazy)r if name in sys.modules)
+            print(json.dumps({"painted_at": time.time(), "loaded": loaded}), flush=True)
+            app.quit()
+        return False
+
+window = get_navigator()
+watcher = FirstPaint()
+window.navigate("LandingPage").installEventFilter(watcher)
+window.show()
+app.exec()
+"""
+
+
+def measure_once():
+    """Launches a fresh interpreter and returns (milliseconds to first paint, eager modules)."""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    started_at = time.time()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD % {"lazy": LAZY_MODULES}],
+        cwd=HERE, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return (result["painted_at"] - started_at) * 1000, result["loaded"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--tolerance", type=float, default=0.20, help="allowed slowdown, 0.20 = 20%%")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    samples = []
+    eager = set()
+    for _ in range(args.runs):
+        elapsed, loaded = measure_once()
+        samples.append(elapsed)
+        eager.update(loaded)
+
+    median = statistics.median(samples)
+    print(f"first paint: median {median:.0f} ms, min {min(samples):.0f} ms, max {max(samples):.0f} ms")
+
+    failed = False
+    if eager:
+        print(f"FAIL: imported before first paint: {', '.join(sorted(eager))}")
+        failed = True
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as baseline_file:
+            json.dump({"first_paint_ms": round(median, 1)}, baseline_file, indent=2)
+        print(f"baseline written to {BASELINE_PATH}")
+    elif os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["first_paint_ms"]
+        limit = baseline * (1 + args.tolerance)
+        print(f"baseline {baseline:.0f} ms, limit {limit:.0f} ms")
+        if median > limit:
+            print("FAIL: startup regressed")
+            failed = True
+    else:
+        print(f"FAIL: no baseline at {BASELINE_PATH}; run with --update-baseline on this machine first")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
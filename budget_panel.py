@@ -0,0 +1,145 @@
+from datetime import date
+from PyQt6.QtWidgets import (
+    QGroupBox, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QProgressBar, QInputDialog, QMessageBox
+)
+import database
+from budgets import BudgetTracker
+from money import Money
+from theme import style
+
+
+def _load_budgets(write_queue, user_id):
+    """Reads the budgets, then the user's queued expenses, which the server's counters can't include yet."""
+    return database.fetch_budgets(user_id), write_queue.pending_for_user(user_id)
+
+
+class BudgetPanel(QGroupBox):
+    """Lists the user's monthly category budgets and raises alerts as expenses are written."""
+
+    def __init__(self, tasks, categories, write_queue, parent=None):
+        super().__init__("Budgets", parent)
+        self.tasks = tasks
+        self.categories = categories
+        self.write_queue = write_queue
+        self.user_id = None
+        self.tracker = BudgetTracker()
+        style(self, "panel")
+
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["Category", "This Month (₱)", "Used"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        layout.addWidget(self.table)
+
+        self.set_button = QPushButton("Set Budget")
+        style(self.set_button, "action", "blue")
+        self.set_button.clicked.connect(self.set_budget)
+
+        self.remove_button = QPushButton("Remove")
+        style(self.remove_button, "action", "red")
+        self.remove_button.clicked.connect(self.remove_budget)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.set_button)
+        button_layout.addWidget(self.remove_button)
+        layout.addLayout(button_layout)
+
+    def refresh(self, user_id):
+        """Re-reads the budgets' counters, which the server keeps in step with every write."""
+        self.user_id = user_id
+        self.tasks.run(_load_budgets, self.write_queue, user_id, on_success=self._on_budgets_loaded)
+
+    def _on_budgets_loaded(self, result):
+        rows, pending = result
+        self.tracker.load(rows)
+        for _, expense_type, amount, created_at in pending:
+            self.tracker.record(expense_type, created_at, amount)  # Already alerted on when added
+        self.show_budgets()
+
+    def show_budgets(self):
+        month = database.month_start(date.today())
+        budgets = sorted(self.tracker.budgets.values(), key=lambda budget: budget.expense_type.lower())
+        self.table.setRowCount(len(budgets))
+        for row, budget in enumerate(budgets):
+            spent = budget.spent_in(month)
+            self.table.setItem(row, 0, QTableWidgetItem(budget.expense_type))
+            self.table.setItem(row, 1, QTableWidgetItem(f"{spent:,.2f} / {budget.limit:,.2f}"))
+
+            percent = spent.cents * 100 // max(budget.limit.cents, 1)
+            used = QProgressBar()
+            used.setRange(0, 100)
+            used.setValue(min(100, percent))
+            used.setFormat(f"{percent}%")
+            self.table.setCellWidget(row, 2, used)
+
+    def record(self, expense_type, created_at, amount):
+        """Counts a written expense against its budget; returns an alert message when a threshold is crossed."""
+        percent = self.tracker.record(expense_type, created_at, amount)
+        self.show_budgets()
+        if percent is None:
+            return None
+        budget = self.tracker.budgets[expense_type]
+        if percent >= 100:
+            return f"You are over your ₱{budget.limit:,.2f} monthly budget for {expense_type} (₱{budget.spent:,.2f} spent)."
+        return f"You have used {percent}% of your ₱{budget.limit:,.2f} monthly budget for {expense_type}."
+
+    def set_budget(self):
+        """Asks for a category and a monthly limit, then saves the budget."""
+        if not self.user_id:
+            return
+        categories = sorted(set(self.categories) | set(self.tracker.budgets))
+        expense_type, ok = QInputDialog.getItem(self, "Set Budget", "Category:", categories, 0, True)
+        expense_type = expense_type.strip()
+        if not ok or not expense_type:
+            return
+
+        current = self.tracker.budgets.get(expense_type)
+        limit_text, ok = QInputDialog.getText(
+            self, "Set Budget", f"Monthly limit for {expense_type} (₱):",
+            text=f"{current.limit:.2f}" if current else ""
+        )
+        if not ok or not limit_text.strip():
+            return
+        try:
+            limit = Money.parse(limit_text)
+        except ValueError:
+            limit = Money()
+        if limit <= Money():
+            QMessageBox.warning(self, "Input Error", "Please enter a positive amount for the budget.")
+            return
+
+        self.tasks.run(
+            database.set_budget, self.user_id, expense_type, limit,
+            on_success=self._on_budget_set,
+            on_error=lambda error: QMessageBox.critical(self, "Database Error", f"Error: {error}")
+        )
+
+    def _on_budget_set(self, row):
+        self.tracker.set(row)
+        self.show_budgets()
+
+    def remove_budget(self):
+        """Deletes the selected category's budget."""
+        row = self.table.currentRow()
+        if not self.user_id or row < 0:
+            return
+        expense_type = self.table.item(row, 0).text()
+        confirmation = QMessageBox.question(self, "Remove Budget", f"Remove the budget for '{expense_type}'?",
+                                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if confirmation != QMessageBox.StandardButton.Yes:
+            return
+
+        self.tasks.run(
+            database.delete_budget, self.user_id, expense_type,
+            on_success=lambda _: self._on_budget_removed(expense_type),
+            on_error=lambda error: QMessageBox.critical(self, "Database Error", f"Error: {error}")
+        )
+
+    def _on_budget_removed(self, expense_type):
+        self.tracker.remove(expense_type)
+        self.show_budgets()
@@ -0,0 +1,64 @@
+from datetime import date
+from database import month_start
+from money import Money
+
+ALERT_PERCENTS = (80, 100)  # Share of a budget at which the user is warned
+
+
+class Budget:
+    """One category's monthly limit and the running total spent in `month`."""
+
+    def __init__(self, expense_type, limit, month, spent):
+        self.expense_type = expense_type
+        self.limit = limit
+        self.month = month
+        self.spent = spent
+
+    def spent_in(self, month):
+        """Returns what was spent in `month`; a counter from an earlier month means nothing yet."""
+        return self.spent if self.month == month else Money()
+
+    def crossed(self, before):
+        """Returns the highest ALERT_PERCENTS level passed on the way from `before` to `spent`, or None."""
+        for percent in reversed(ALERT_PERCENTS):
+            threshold = self.limit.cents * percent
+            if before.cents * 100 < threshold <= self.spent.cents * 100:
+                return percent
+        return None
+
+
+class BudgetTracker:
+    """The dashboard's copy of the budgets' running counters.
+
+    record() applies one write the same way the database's counters do, so an
+    alert costs a dict lookup and a comparison instead of re-adding the month's
+    expenses. It also works for expenses still waiting in the offline queue.
+    """
+
+    def __init__(self):
+        self.budgets = {}
+
+    def load(self, rows):
+        """Replaces the counters with database.fetch_budgets() rows."""
+        self.budgets = {row[0]: Budget(*row) for row in rows}
+
+    def set(self, row):
+        self.budgets[row[0]] = Budget(*row)
+
+    def remove(self, expense_type):
+        self.budgets.pop(expense_type, None)
+
+    def record(self, expense_type, created_at, amount):
+        """Adds an expense's amount (negative to take one back); returns the alert percent crossed, or None."""
+        budget = self.budgets.get(expense_type)
+        if budget is None:
+            return None
+        month = month_start(created_at.date())
+        if month < budget.month or month > month_start(date.today()):
+            return None  # Same rule as the database: only the current month counts
+        if month > budget.month:
+            budget.month, budget.spent = month, Money()
+
+        before = budget.spent
+        budget.spent = before + amount
+        return budget.crossed(before)
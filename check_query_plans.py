@@ -0,0 +1,88 @@
+"""Query-plan check for the dashboard's database-side filters.
+
+    python check_query_plans.py                  # uses the configured backend
+    python check_query_plans.py --user-id 6      # plan against a specific user's data
+    EXPENSE_TRACKER_BACKEND=sqlite python check_query_plans.py
+
+Runs EXPLAIN on every query shape expense_query.build_expense_query() and
+build_spending_query() produce and exits non-zero when one of them scans a
+table instead of using an index, or sorts a page the keyset index should
+already return in (created_at, id) order. Re-run it after changing the builder or the keys in expense_tracker.sql.
+"""
+import argparse
+import sys
+from datetime import datetime
+import database
+from expense_query import ExpenseFilter, build_expense_query, build_spending_query
+from money import Money
+
+SAMPLE_TYPES = ["Food", "Transportation", "Bills"]
+KEYSET_ORDERED = {"no filter", "date range", "next page"}  # Must come straight off an index in page order
+
+
+def query_shapes(user_id):
+    """Yields (label, sql, params) for each kind of filter the dashboard can send."""
+    cases = [
+        ("no filter", ExpenseFilter(), None),
+        ("type set", ExpenseFilter(types=["Food", "Bills"]), None),
+        ("text search", ExpenseFilter(text="foo"), None),
+        ("amount range", ExpenseFilter(min_amount=Money.parse("100"), max_amount=Money.parse("500")), None),
+        ("date range", ExpenseFilter(date_from=datetime(2024, 1, 1), date_to=datetime(2024, 7, 1)), None),
+        ("type + amount + date", ExpenseFilter(
+            types=["Food"], min_amount=Money.parse("10"), date_from=datetime(2024, 1, 1)
+        ), None),
+        ("next page", ExpenseFilter(types=["Food"]), (datetime(2024, 6, 1), 1000))
+    ]
+    for label, criteria, after in cases:
+        query = build_expense_query(user_id, criteria, SAMPLE_TYPES, after=after)
+        if query is not None:
+            yield (label,) + query
+
+    for order_by in ("amount", "expense_type"):
+        yield (f"sorted by {order_by}",) + build_expense_query(user_id, ExpenseFilter(), order_by=order_by)
+
+    yield ("spending chart",) + build_spending_query(user_id, ExpenseFilter(date_from=datetime(2024, 1, 1)))
+    yield ("spending chart by type",) + build_spending_query(user_id, ExpenseFilter(types=["Food"]))
+
+
+def full_scans(backend, sql, params):
+    """Returns the plan lines that read the expenses table without an index."""
+    if backend.name == "sqlite":
+        plan = database.fetch_all("EXPLAIN QUERY PLAN " + sql, params)
+        details = [row[3] for row in plan]
+        return details, [detail for detail in details if detail.startswith("SCAN") and "INDEX" not in detail]
+
+    # MySQL columns: id, select_type, table, partitions, type, possible_keys, key, ...
+    plan = database.fetch_all("EXPLAIN " + sql, params)
+    details = [f"table={row[2]} type={row[4]} key={row[6]} rows={row[9]} extra={row[11]}" for row in plan]
+    return details, [detail for detail, row in zip(details, plan) if row[4] == "ALL" or row[6] is None]
+
+
+def sorts(backend, details):
+    """Returns the plan lines that sort rows after reading them."""
+    if backend.name == "sqlite":
+        return [detail for detail in details if "TEMP B-TREE FOR" in detail and "ORDER BY" in detail]
+    return [detail for detail in details if "filesort" in detail]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, default=6)
+    args = parser.parse_args()
+
+    backend = database.get_backend()
+    failed = False
+    for label, sql, params in query_shapes(args.user_id):
+        details, scans = full_scans(backend, sql, params)
+        if label in KEYSET_ORDERED:
+            scans = scans + sorts(backend, details)
+        print(f"{'FAIL' if scans else 'ok  '} {label}")
+        for detail in details:
+            print(f"       {detail}")
+        failed = failed or bool(scans)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,45 @@
 import sys
-import mysql.connector
+from datetime import date, datetime, time, timedelta
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout,
-    QHBoxLayout, QTableWidget, QTableWidgetItem, QMessageBox,
-    QComboBox, QLineEdit, QGroupBox, QHeaderView, QInputDialog
+    QHBoxLayout, QTableView, QMessageBox,
+    QComboBox, QLineEdit, QGroupBox, QHeaderView, QInputDialog,
+    QFileDialog, QProgressDialog, QDateEdit
 )
-from PyQt6.QtCore import Qt, QSettings
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import Qt, QSettings, QTimer, QDate
+from PyQt6.QtGui import QDoubleValidator
+import database
+import importer
+import exporter
+from workers import TaskRunner
+from write_queue import WriteQueue
+from expense_model import ExpenseTableModel, ActionButtonDelegate, ACTIONS_COLUMN
+from expense_filter import ExpenseFilterProxy, DATE_COLUMN
+from expense_query import ExpenseFilter
+from summary_panel import SummaryPanel
+from insights_panel import InsightsPanel
+from spending_chart import SpendingChartPanel
+from budget_panel import BudgetPanel
+from recurring import FREQUENCIES
+from recurring_dialog import RecurringDialog
+from expense_cache import get_expense_cache
+from money import Money
+import theme
+from theme import style
+
+SYNC_RETRY_MIN_MS = 2000
+SYNC_RETRY_MAX_MS = 60000
+ANY_DATE = QDate(2000, 1, 1)  # The date edits' "no limit" value
+SERVER_FILTER_DELAY_MS = 400
+RECURRING_CHECK_MAX_MS = 24 * 60 * 60 * 1000  # Looks for due recurring expenses at least daily
+EXPENSE_TYPES = ["Food", "Transportation", "Bills", "Entertainment", "Shopping", "Health", "Others"]
+
+
+def _start_recurring(user_id, expense_type, amount, frequency, start_date):
+    """Saves a recurring expense and writes its first occurrence. Runs on a worker thread."""
+    database.add_recurring(user_id, expense_type, amount, frequency, start_date)
+    return database.materialize_recurring(user_id, start_date)
+
 
 class Dashboard(QWidget):
     def __init__(self):
@@ -14,56 +47,140 @@ class Dashboard(QWidget):
 
         self.setWindowTitle("Expense Management Dashboard")
         self.resize(900, 650)
-        self.setStyleSheet("background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:1, stop:0 #30475E, stop:1 #222831);")
+        self.tasks = TaskRunner(self)
+
+        # **Offline Write Queue** - new expenses are journaled locally, then synced
+        self.write_queue = WriteQueue()
+        self.syncing = False
+        self.sync_delay = SYNC_RETRY_MIN_MS
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.timeout.connect(self.sync_pending)
+        self.recurring_timer = QTimer(self)
+        self.recurring_timer.setSingleShot(True)
+        self.recurring_timer.timeout.connect(lambda: self.run_recurring(self.expense_model.user_id))
+        self.setObjectName("dashboard")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)  # Lets the theme paint the gradient
 
         
         self.page_header = QLabel("Expense Dashboard")
-        self.page_header.setStyleSheet("font-size: 28px; font-weight: bold; color: white; padding: 12px;")
+        style(self.page_header, "dashboardTitle")
         self.page_header.setAlignment(Qt.AlignmentFlag.AlignLeft)
 
         
         self.logout_button = QPushButton("Log Out")
-        self.logout_button.setStyleSheet("""
-            QPushButton {
-                padding: 10px;
-                font-size: 16px;
-                font-weight: bold;
-                background-color: #dc3545;
-                color: white;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #c82333;
-            }
-        """)
+        style(self.logout_button, "toolbar", "red")
         self.logout_button.clicked.connect(self.logout)
 
+        self.import_button = QPushButton("Import CSV")
+        style(self.import_button, "toolbar", "green")
+        self.import_button.clicked.connect(self.import_expenses)
+
+        self.export_button = QPushButton("Export")
+        style(self.export_button, "toolbar", "blue")
+        self.export_button.clicked.connect(self.export_expenses)
+
+        self.recurring_button = QPushButton("Recurring")
+        style(self.recurring_button, "toolbar", "green")
+        self.recurring_button.clicked.connect(self.show_recurring)
+
+        self.theme_button = QPushButton("Theme")
+        style(self.theme_button, "toolbar", "blue")
+        self.theme_button.clicked.connect(theme.toggle_theme)
+
     
         header_layout = QHBoxLayout()
         header_layout.addWidget(self.page_header)
         header_layout.addStretch()
+        header_layout.addWidget(self.import_button)
+        header_layout.addWidget(self.export_button)
+        header_layout.addWidget(self.recurring_button)
+        header_layout.addWidget(self.theme_button)
         header_layout.addWidget(self.logout_button)
 
+        self.status_label = QLabel("")
+        style(self.status_label, "status")
+
         
-        self.expense_table = QTableWidget()
-        self.expense_table.setColumnCount(3)
-        self.expense_table.setHorizontalHeaderLabels(["Expense Type", "Amount (₱)", "Actions"])
+        self.expense_model = ExpenseTableModel(self.tasks, self)
+        self.expense_model.loading_changed.connect(
+            lambda loading: self.set_status("Loading expenses..." if loading else "")
+        )
+        self.expense_model.load_failed.connect(self.show_database_error)
+        self.action_delegate = ActionButtonDelegate(self)
+        self.action_delegate.edit_clicked.connect(self.edit_expense)
+        self.action_delegate.delete_clicked.connect(self.confirm_delete)
+
+        # **Filter Bar** - filters and sorts the loaded rows through the proxy's indexes
+        self.expense_proxy = ExpenseFilterProxy(self)
+        self.expense_proxy.setSourceModel(self.expense_model)
+        self.server_filter_timer = QTimer(self)
+        self.server_filter_timer.setSingleShot(True)
+        self.server_filter_timer.timeout.connect(
+            lambda: self.expense_model.set_server_filter(self.expense_proxy.criteria)
+        )
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search expense type...")
+        self.search_input.textChanged.connect(self.apply_filter)
+
+        self.min_amount_input = self._amount_filter_input("Min ₱")
+        self.max_amount_input = self._amount_filter_input("Max ₱")
+        self.date_from_input = self._date_filter_input()
+        self.date_to_input = self._date_filter_input()
+
+        self.clear_filter_button = QPushButton("Clear")
+        self.clear_filter_button.clicked.connect(self.clear_filter)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(self.search_input, 2)
+        filter_layout.addWidget(self.min_amount_input)
+        filter_layout.addWidget(self.max_amount_input)
+        filter_layout.addWidget(self.date_from_input)
+        filter_layout.addWidget(self.date_to_input)
+        filter_layout.addWidget(self.clear_filter_button)
+
+        self.expense_table = QTableView()
+        self.expense_table.setModel(self.expense_proxy)
+        self.expense_table.setSortingEnabled(True)
+        self.expense_table.sortByColumn(DATE_COLUMN, Qt.SortOrder.DescendingOrder)
+        self.expense_table.setItemDelegateForColumn(ACTIONS_COLUMN, self.action_delegate)
         self.expense_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.expense_table.verticalHeader().setVisible(False)
+        # Fixed row heights let the view skip measuring every row it is not drawing
+        self.expense_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.expense_table.verticalHeader().setDefaultSectionSize(32)
+        self.expense_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+
+        self.summary_panel = SummaryPanel(self.tasks)
+        self.insights_panel = InsightsPanel(self.tasks)
+        self.summary_panel.summary_loaded.connect(self.insights_panel.show_summary_insights)
+        self.chart_panel = SpendingChartPanel(self.tasks)
+        self.budget_panel = BudgetPanel(self.tasks, EXPENSE_TYPES, self.write_queue)
+        self.expense_model.cache_invalidated.connect(lambda: self.refresh_reports(self.expense_model.user_id))
+
+        reports_layout = QVBoxLayout()
+        reports_layout.addWidget(self.budget_panel)
+        reports_layout.addWidget(self.summary_panel)
+        reports_layout.addWidget(self.insights_panel)
+
+        table_layout = QHBoxLayout()
+        table_layout.addWidget(self.expense_table, 3)
+        table_layout.addLayout(reports_layout, 1)
 
 
         self.form_box = QGroupBox("Add New Expense")
-        self.form_box.setStyleSheet("border: 2px solid white; padding: 20px; background-color: rgba(0, 0, 0, 0.6); color: white;")
+        style(self.form_box, "panel")
         form_layout = QVBoxLayout()
 
 
         dropdown_layout = QHBoxLayout()
         self.expense_type_label = QLabel("Expense Type")
-        self.expense_type_label.setStyleSheet("font-size: 18px; color: white;")
+        style(self.expense_type_label, "formLabel")
         dropdown_layout.addWidget(self.expense_type_label)
 
         self.expense_type_dropdown = QComboBox()
-        self.expense_type_dropdown.addItems(["Food", "Transportation", "Bills", "Entertainment", "Shopping", "Health", "Others", "Custom"])
+        self.expense_type_dropdown.addItems(EXPENSE_TYPES + ["Custom"])
         self.expense_type_dropdown.currentIndexChanged.connect(self.handle_custom_expense)
         dropdown_layout.addWidget(self.expense_type_dropdown)
         form_layout.addLayout(dropdown_layout)
@@ -76,28 +193,20 @@ class Dashboard(QWidget):
 
 
         self.amount_label = QLabel("Amount (₱)")
-        self.amount_label.setStyleSheet("font-size: 18px; color: white;")
+        style(self.amount_label, "formLabel")
         form_layout.addWidget(self.amount_label)
 
         self.amount_input = QLineEdit()
         self.amount_input.setPlaceholderText("Enter amount spent")
         form_layout.addWidget(self.amount_input)
 
+        self.repeat_dropdown = QComboBox()
+        self.repeat_dropdown.addItems(["Does not repeat"] + list(FREQUENCIES))
+        form_layout.addWidget(self.repeat_dropdown)
+
         
         self.add_button = QPushButton("Add Expense")
-        self.add_button.setStyleSheet("""
-            QPushButton {
-                padding: 14px;
-                font-size: 20px;
-                font-weight: bold;
-                border-radius: 6px;
-                background-color: #007BFF;
-                color: white;
-            }
-            QPushButton:hover {
-                background-color: #0056b3;
-            }
-        """)
+        style(self.add_button, "submit", "blue")
         self.add_button.clicked.connect(self.add_expense)
         form_layout.addWidget(self.add_button)
 
@@ -106,12 +215,78 @@ class Dashboard(QWidget):
         
         main_layout = QVBoxLayout(self)
         main_layout.addLayout(header_layout)
-        main_layout.addWidget(self.expense_table)
+        main_layout.addWidget(self.status_label)
+        main_layout.addLayout(filter_layout)
+        main_layout.addWidget(self.chart_panel)
+        main_layout.addLayout(table_layout)
         main_layout.addWidget(self.form_box)
         self.setLayout(main_layout)
 
         self.load_user_expenses()
 
+    def _amount_filter_input(self, placeholder):
+        amount_input = QLineEdit()
+        amount_input.setPlaceholderText(placeholder)
+        amount_input.setValidator(QDoubleValidator(0, 1e9, 2))
+        amount_input.textChanged.connect(self.apply_filter)
+        return amount_input
+
+    def _date_filter_input(self):
+        date_input = QDateEdit()
+        date_input.setCalendarPopup(True)
+        date_input.setDisplayFormat("yyyy-MM-dd")
+        date_input.setMinimumDate(ANY_DATE)
+        date_input.setSpecialValueText("Any date")
+        date_input.setDate(ANY_DATE)
+        date_input.dateChanged.connect(self.apply_filter)
+        return date_input
+
+    def apply_filter(self):
+        """Filters the loaded rows as the user types, then asks the database for the rest."""
+        date_from = self.date_from_input.date()
+        date_to = self.date_to_input.date()
+        criteria = ExpenseFilter(
+            text=self.search_input.text(),
+            min_amount=self._filter_amount(self.min_amount_input),
+            max_amount=self._filter_amount(self.max_amount_input),
+            date_from=None if date_from == ANY_DATE else datetime.combine(date_from.toPyDate(), time.min),
+            date_to=None if date_to == ANY_DATE else datetime.combine(date_to.toPyDate() + timedelta(days=1), time.min)
+        )
+        self.expense_proxy.set_filter(criteria)
+        self.chart_panel.set_filter(criteria)
+
+        # Rows not loaded yet can only be searched by the database; wait for a pause in typing
+        full_history = self.expense_model.criteria is None
+        if not (full_history and (criteria.is_empty() or self.expense_model.is_complete())):
+            self.server_filter_timer.start(SERVER_FILTER_DELAY_MS)
+        else:
+            self.server_filter_timer.stop()
+
+        if self.expense_proxy.is_filtered():
+            self.set_status(f"Showing {self.expense_proxy.rowCount()} of {self.expense_model.rowCount()} loaded expenses")
+        else:
+            self.set_status("")
+
+    def _filter_amount(self, amount_input):
+        try:
+            return Money.parse(amount_input.text()) if amount_input.text() else None
+        except ValueError:
+            return None
+
+    def clear_filter(self):
+        """Resets every filter field and shows all loaded expenses again."""
+        inputs = (self.search_input, self.min_amount_input, self.max_amount_input, self.date_from_input, self.date_to_input)
+        for widget in inputs:
+            widget.blockSignals(True)  # Refilter once at the end, not once per field
+        self.search_input.clear()
+        self.min_amount_input.clear()
+        self.max_amount_input.clear()
+        self.date_from_input.setDate(ANY_DATE)
+        self.date_to_input.setDate(ANY_DATE)
+        for widget in inputs:
+            widget.blockSignals(False)
+        self.apply_filter()
+
     def handle_custom_expense(self):
         """Shows input field when 'Custom' is selected."""
         self.custom_expense_input.setVisible(self.expense_type_dropdown.currentText() == "Custom")
@@ -125,38 +300,32 @@ class Dashboard(QWidget):
             QMessageBox.warning(self, "Session Error", "User session not found. Please log in again.")
             return
 
-        try:
-            db = mysql.connector.connect(host="localhost", user="root", password="", database="expense_tracker")
-            cursor = db.cursor()
-            cursor.execute("SELECT expense_type, amount FROM expenses WHERE user_id = %s", (user_id,))
-            expenses = cursor.fetchall()
-            db.close()
-
-            self.expense_table.setRowCount(0)
-            for expense_type, amount in expenses:
-                row_position = self.expense_table.rowCount()
-                self.expense_table.insertRow(row_position)
-                self.expense_table.setItem(row_position, 0, QTableWidgetItem(expense_type))
-                self.expense_table.setItem(row_position, 1, QTableWidgetItem(f"₱{amount:.2f}"))
-                self.add_buttons_to_row(row_position)
-
-        except mysql.connector.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Error: {e}")
-
-    def add_buttons_to_row(self, row_position):
-        """Adds edit and delete buttons dynamically."""
-        edit_button = QPushButton("Edit")
-        edit_button.clicked.connect(lambda _, r=row_position: self.edit_expense(r))
-        
-        delete_button = QPushButton("Delete")
-        delete_button.clicked.connect(lambda _, r=row_position: self.confirm_delete(r))
-
-        action_widget = QWidget()
-        layout = QHBoxLayout(action_widget)
-        layout.addWidget(edit_button)
-        layout.addWidget(delete_button)
-        layout.setContentsMargins(0, 0, 0, 0)
-        self.expense_table.setCellWidget(row_position, 2, action_widget)
+        # Only the first page is queried here; the view asks for more as the user scrolls
+        self.expense_model.start(user_id)
+        self.refresh_reports(user_id)
+
+        # Expenses still queued from an earlier session show above the server's rows
+        for client_key, expense_type, amount, created_at in self.write_queue.pending_for_user(user_id):
+            self.expense_model.prepend_expense(client_key, expense_type, amount, created_at)
+        self.schedule_sync(0)
+        self.run_recurring(user_id)
+
+    def refresh_reports(self, user_id):
+        """Updates the budgets, summary totals, insights and spending chart after the expenses changed."""
+        self.insights_panel.refresh(user_id)
+        self.summary_panel.refresh(user_id)  # Also hands its summary to the insights panel
+        self.chart_panel.refresh(user_id)
+        self.budget_panel.refresh(user_id)
+
+    def set_status(self, text):
+        """Shows a loading/progress message above the table."""
+        self.status_label.setText(text)
+
+    def show_database_error(self, error):
+        """Reports a failed background query."""
+        self.set_status("")
+        self.add_button.setEnabled(True)
+        QMessageBox.critical(self, "Database Error", f"Error: {error}")
 
     def add_expense(self):
         """Adds a new expense to the table and inserts it into the database."""
@@ -168,11 +337,13 @@ class Dashboard(QWidget):
         if not expense_type or not amount_text:
             QMessageBox.warning(self, "Input Error", "Please enter both expense type and amount.")
             return
+        if not self.check_expense_type(expense_type):
+            return
 
         try:
-            amount = float(amount_text)
-        except ValueError:
-            QMessageBox.warning(self, "Input Error", "Please enter a valid number for amount.")
+            amount = Money.parse_expense(amount_text)
+        except ValueError as e:
+            QMessageBox.warning(self, "Input Error", f"Please enter a valid number for amount ({e}).")
             return
 
         settings = QSettings("MyApp", "ExpenseTracker")
@@ -182,66 +353,218 @@ class Dashboard(QWidget):
             QMessageBox.warning(self, "Session Error", "User session not found. Please log in again.")
             return
 
+        created_at = datetime.now().replace(microsecond=0)
+
+        frequency = FREQUENCIES.get(self.repeat_dropdown.currentText())
+        if frequency:
+            # Saved as a template on the server; its first occurrence is written with it
+            self.add_button.setEnabled(False)
+            self.tasks.run(
+                _start_recurring, user_id, expense_type, amount, frequency, created_at.date(),
+                on_success=lambda result: self.on_recurring_started(expense_type, amount, created_at, result),
+                on_error=self.show_database_error
+            )
+            return
+
+        # Journal locally first: the row shows at once, the server gets it on the next sync
         try:
-            db = mysql.connector.connect(host="localhost", user="root", password="", database="expense_tracker")
-            cursor = db.cursor()
-            cursor.execute("INSERT INTO expenses (user_id, expense_type, amount) VALUES (%s, %s, %s)", 
-                        (user_id, expense_type, amount))
-            db.commit()
-            db.close()
-
-            self.load_user_expenses()
-            self.expense_type_dropdown.setCurrentIndex(0)
-            self.custom_expense_input.clear()
-            self.amount_input.clear()
+            client_key = self.write_queue.enqueue(user_id, expense_type, amount, created_at)
+        except OSError as e:
+            QMessageBox.critical(self, "Save Error", f"Error: {e}")
+            return
 
+        self.expense_model.prepend_expense(client_key, expense_type, amount, created_at)
+        self.clear_form()
+        self.schedule_sync(0)
+        self.report_added(self.budget_panel.record(expense_type, created_at, amount))
+
+    def check_expense_type(self, expense_type):
+        """Warns and returns False when a typed category is longer than the database stores."""
+        if len(expense_type) > database.MAX_EXPENSE_TYPE_LENGTH:
+            QMessageBox.warning(
+                self, "Input Error", f"Expense types can be at most {database.MAX_EXPENSE_TYPE_LENGTH} characters."
+            )
+            return False
+        return True
+
+    def clear_form(self):
+        self.expense_type_dropdown.setCurrentIndex(0)
+        self.custom_expense_input.clear()
+        self.amount_input.clear()
+        self.repeat_dropdown.setCurrentIndex(0)
+
+    def report_added(self, alert):
+        """Confirms an added expense, with the budget alert it raised if any."""
+        if alert:
+            QMessageBox.warning(self, "Budget Alert", f"Expense added.\n\n{alert}")
+        else:
             QMessageBox.information(self, "Success", "Expense added successfully!")
 
-        except mysql.connector.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Error: {e}")
+    # **Recurring Expenses**
+    def on_recurring_started(self, expense_type, amount, created_at, result):
+        """Shows a new recurring expense's first occurrence once the template is saved."""
+        self.add_button.setEnabled(True)
+        self.clear_form()
+        alert = self.budget_panel.record(expense_type, created_at, amount)
+        self.on_recurring_materialized(result)
+        self.report_added(alert)
+
+    def run_recurring(self, user_id):
+        """Writes any recurring expenses that fell due, including ones missed while the app was closed."""
+        if not user_id:
+            return
+        self.recurring_timer.stop()
+        self.tasks.run(database.materialize_recurring, user_id, date.today(), on_success=self.on_recurring_materialized)
+
+    def on_recurring_materialized(self, result):
+        count, _ = result
+        if count:
+            get_expense_cache().invalidate(self.expense_model.user_id)
+            self.load_user_expenses()  # Runs the scheduler again, which finds nothing due and re-arms the timer
+            return
+        self.tasks.run(
+            database.fetch_next_recurring_run, self.expense_model.user_id, on_success=self.schedule_recurring
+        )
+
+    def schedule_recurring(self, next_run):
+        """Wakes the scheduler when the next template falls due (re-checking daily at most)."""
+        if next_run is None:
+            return
+        delay_ms = int((datetime.combine(next_run, time.min) - datetime.now()).total_seconds() * 1000)
+        self.recurring_timer.start(max(1000, min(delay_ms, RECURRING_CHECK_MAX_MS)))
+
+    def show_recurring(self):
+        """Opens the list of recurring expenses."""
+        if not self.expense_model.user_id:
+            return
+        RecurringDialog(self.tasks, self.expense_model.user_id, self).exec()
+
+    # **Background Sync**
+    def schedule_sync(self, delay_ms):
+        """Starts (or restarts) the countdown to the next flush of the write queue."""
+        self.sync_timer.start(delay_ms)
+
+    def sync_pending(self):
+        """Sends the oldest batch of queued expenses to the server on a worker thread."""
+        if self.syncing:
+            return
+        self.syncing = True
+        self.tasks.run(self.write_queue.flush, on_success=self.on_synced, on_error=self.on_sync_failed)
+
+    def on_synced(self, result):
+        """Gives synced rows their server ids and keeps flushing until the queue is empty."""
+        synced, versions, rejected = result
+        self.syncing = False
+        self.sync_delay = SYNC_RETRY_MIN_MS
+        added = []
+        for client_key, expense_id in synced.items():
+            self.expense_model.replace_id(client_key, expense_id)
+            row = self.expense_model.row_of(expense_id)
+            if row is not None:
+                added.append(self.expense_model.expense_at(row))
+
+        cache = get_expense_cache()
+        for user_id, version in versions.items():
+            if str(user_id) == str(self.expense_model.user_id):
+                cache.add(user_id, added, version)
+            else:
+                cache.invalidate(user_id)  # Rows queued by another account on this machine
+
+        if rejected:
+            self.show_rejected(rejected)
+        if synced or rejected:
+            self.refresh_reports(self.expense_model.user_id)
+            self.schedule_sync(0)
+        else:
+            self.set_status("")
+
+    def show_rejected(self, rejected):
+        """Takes expenses the server refused out of the table and tells the user which ones."""
+        lines = []
+        for client_key, user_id, expense_type, amount, created_at, error in rejected:
+            if str(user_id) != str(self.expense_model.user_id):
+                continue
+            self.expense_model.remove_expense(client_key)
+            self.budget_panel.record(expense_type, created_at, -amount)
+            lines.append(f"{created_at:%Y-%m-%d %H:%M}  {expense_type[:40]}  ₱{amount:,.2f}: {error}")
+        if lines:
+            QMessageBox.warning(
+                self, "Expenses Not Saved",
+                "The server refused these expenses, so they were not saved:\n\n" + "\n".join(lines)
+            )
+
+    def on_sync_failed(self, error):
+        """Keeps the expenses queued and retries with exponential backoff."""
+        self.syncing = False
+        self.set_status(f"Offline: {self.write_queue.count()} expense(s) waiting to sync ({error})")
+        self.schedule_sync(self.sync_delay)
+        self.sync_delay = min(self.sync_delay * 2, SYNC_RETRY_MAX_MS)
+
+    def warn_if_pending(self, expense_id):
+        """Tells the user to wait when a row only exists in the local write queue so far."""
+        if isinstance(expense_id, str):
+            QMessageBox.information(self, "Please Wait", "This expense is still being saved. Try again in a moment.")
+            return True
+        return False
 
     def edit_expense(self, row_position):
         """Allows the user to edit an expense entry."""
-        expense_type = self.expense_table.item(row_position, 0).text()
-        amount_text = self.expense_table.item(row_position, 1).text().replace("₱", "")
+        expense_id, expense_type, amount, created_at = self.expense_proxy.expense_at(row_position)
+        if self.warn_if_pending(expense_id):
+            return
+        amount_text = f"{amount:.2f}"
 
         new_expense_type, ok_type = QInputDialog.getText(self, "Edit Expense", "Enter new expense type:", text=expense_type)
         if not ok_type or not new_expense_type.strip():
             return
 
+        new_expense_type = new_expense_type.strip()
+        if not self.check_expense_type(new_expense_type):
+            return
+
         new_amount_text, ok_amount = QInputDialog.getText(self, "Edit Expense", "Enter new amount:", text=amount_text)
         if not ok_amount or not new_amount_text.strip():
             return
 
         try:
-            new_amount = float(new_amount_text)
-        except ValueError:
-            QMessageBox.warning(self, "Input Error", "Please enter a valid number for amount.")
+            new_amount = Money.parse_expense(new_amount_text)
+        except ValueError as e:
+            QMessageBox.warning(self, "Input Error", f"Please enter a valid number for amount ({e}).")
             return
 
         settings = QSettings("MyApp", "ExpenseTracker")
         user_id = settings.value("user_id")
 
-        try:
-            db = mysql.connector.connect(host="localhost", user="root", password="", database="expense_tracker")
-            cursor = db.cursor()
-            cursor.execute("""
-                UPDATE expenses SET expense_type = %s, amount = %s 
-                WHERE user_id = %s AND expense_type = %s AND amount = %s
-            """, (new_expense_type, new_amount, user_id, expense_type, float(amount_text)))
-            db.commit()
-            db.close()
-            self.load_user_expenses()
-
+        self.set_status("Saving changes...")
+        self.tasks.run(
+            database.update_expense, user_id, expense_id, new_expense_type, new_amount,
+            on_success=lambda version: self.on_expense_updated(
+                expense_id, new_expense_type, new_amount, version, (expense_type, amount, created_at)
+            ),
+            on_error=self.show_database_error
+        )
+
+    def on_expense_updated(self, expense_id, expense_type, amount, version, old):
+        """Repaints the edited row once the update is committed; `old` is its (type, amount, created_at) before."""
+        self.expense_model.update_expense(expense_id, expense_type, amount)
+        get_expense_cache().update(self.expense_model.user_id, expense_id, expense_type, amount, version)
+        self.set_status("")
+
+        old_type, old_amount, created_at = old
+        self.budget_panel.record(old_type, created_at, -old_amount)
+        alert = self.budget_panel.record(expense_type, created_at, amount)
+        self.refresh_reports(self.expense_model.user_id)
+
+        if alert:
+            QMessageBox.warning(self, "Budget Alert", f"Expense updated.\n\n{alert}")
+        else:
             QMessageBox.information(self, "Success", "Expense updated successfully!")
 
-        except mysql.connector.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Error: {e}")
-
     def confirm_delete(self, row_position):
         """Confirms and deletes an expense from both the UI and database."""
-        expense_type = self.expense_table.item(row_position, 0).text()
-        amount_text = self.expense_table.item(row_position, 1).text().replace("₱", "")
+        expense_id, expense_type, amount, created_at = self.expense_proxy.expense_at(row_position)
+        if self.warn_if_pending(expense_id):
+            return
 
         confirmation = QMessageBox.question(self, "Delete Expense", f"Are you sure you want to delete '{expense_type}'?",
                                             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
@@ -251,18 +574,112 @@ class Dashboard(QWidget):
         settings = QSettings("MyApp", "ExpenseTracker")
         user_id = settings.value("user_id")
 
-        try:
-            db = mysql.connector.connect(host="localhost", user="root", password="", database="expense_tracker")
-            cursor = db.cursor()
-            cursor.execute("DELETE FROM expenses WHERE user_id = %s AND expense_type = %s AND amount = %s",
-                        (user_id, expense_type, float(amount_text)))
-            db.commit()
-            db.close()
-        except mysql.connector.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Error: {e}")
+        self.set_status("Deleting expense...")
+        self.tasks.run(
+            database.delete_expense, user_id, expense_id,
+            on_success=lambda version: self.on_expense_deleted(expense_id, version, (expense_type, amount, created_at)),
+            on_error=self.show_database_error
+        )
+
+    def on_expense_deleted(self, expense_id, version, old):
+        """Drops a deleted expense from the table and takes it off its budget."""
+        self.expense_model.remove_expense(expense_id)
+        get_expense_cache().remove(self.expense_model.user_id, expense_id, version)
+        self.set_status("")
+
+        old_type, old_amount, created_at = old
+        self.budget_panel.record(old_type, created_at, -old_amount)
+        self.refresh_reports(self.expense_model.user_id)
+
+    def import_expenses(self):
+        """Imports a CSV/bank statement on a worker thread with a progress dialog."""
+        user_id = self.expense_model.user_id
+        if not user_id:
+            QMessageBox.warning(self, "Session Error", "User session not found. Please log in again.")
             return
 
-        self.expense_table.removeRow(row_position)
+        path, _ = QFileDialog.getOpenFileName(self, "Import Expenses", "", "CSV Files (*.csv);;All Files (*)")
+        if not path:
+            return
+
+        self.import_progress = QProgressDialog("Importing expenses...", "Cancel", 0, 100, self)
+        self.import_progress.setWindowTitle("Import CSV")
+        self.import_progress.setMinimumDuration(0)
+        self.import_button.setEnabled(False)
+
+        task = self.tasks.run(
+            importer.import_csv, path, user_id,
+            on_progress=self.import_progress.setValue,
+            on_success=self.on_import_finished,
+            on_error=self.on_import_failed
+        )
+        # Stops the import after the chunk in flight; earlier chunks stay committed and
+        # on_import_finished still runs, so the table and reports pick them up
+        self.import_progress.canceled.connect(task.request_stop)
+
+    def on_import_finished(self, result):
+        """Reloads the table and reports what the import did."""
+        self.import_progress.close()
+        self.import_button.setEnabled(True)
+        get_expense_cache().invalidate(self.expense_model.user_id)
+        self.load_user_expenses()
+
+        message = f"Imported {result.imported} expenses, skipped {result.skipped} rows."
+        if result.credits:
+            message += f" Left out {result.credits} incoming payments (credits)."
+        if result.cancelled:
+            message = "Import cancelled. " + message
+        if result.errors:
+            message += "\n\n" + "\n".join(result.errors)
+        QMessageBox.information(self, "Import Cancelled" if result.cancelled else "Import Complete", message)
+
+    def on_import_failed(self, error):
+        """Reports an import that stopped on a bad file or a database error."""
+        self.import_progress.close()
+        self.import_button.setEnabled(True)
+        get_expense_cache().invalidate(self.expense_model.user_id)
+        self.load_user_expenses()
+        QMessageBox.critical(self, "Import Error", f"Error: {error}")
+
+    def export_expenses(self):
+        """Streams the user's expenses to a CSV or Parquet file on a worker thread."""
+        user_id = self.expense_model.user_id
+        if not user_id:
+            QMessageBox.warning(self, "Session Error", "User session not found. Please log in again.")
+            return
+
+        file_filter = "CSV Files (*.csv)"
+        if exporter.parquet_available():
+            file_filter += ";;Parquet Files (*.parquet)"
+        path, _ = QFileDialog.getSaveFileName(self, "Export Expenses", "expenses.csv", file_filter)
+        if not path:
+            return
+
+        self.export_progress = QProgressDialog("Exporting expenses...", "Cancel", 0, 100, self)
+        self.export_progress.setWindowTitle("Export")
+        self.export_progress.setMinimumDuration(0)
+        self.export_button.setEnabled(False)
+
+        task = self.tasks.run(
+            exporter.export_expenses, path, user_id,
+            on_progress=self.export_progress.setValue,
+            on_success=self.on_export_finished,
+            on_error=self.on_export_failed
+        )
+        self.export_progress.canceled.connect(task.cancel)
+        self.export_progress.canceled.connect(lambda: self.export_button.setEnabled(True))
+
+    def on_export_finished(self, written):
+        """Reports how many rows were written."""
+        self.export_progress.close()
+        self.export_button.setEnabled(True)
+        QMessageBox.information(self, "Export Complete", f"Exported {written} expenses.")
+
+    def on_export_failed(self, error):
+        """Reports an export that stopped on an error."""
+        self.export_progress.close()
+        self.export_button.setEnabled(True)
+        QMessageBox.critical(self, "Export Error", f"Error: {error}")
 
     def logout(self):
         """Logs the user out by clearing session data and closing the dashboard."""
@@ -270,13 +687,33 @@ class Dashboard(QWidget):
         settings.remove("user_id")
 
         QMessageBox.information(self, "Logged Out", "You have been logged out.")
-        self.close()
+
+        from navigator import get_navigator
+        navigator = get_navigator()
+        navigator.navigate("LandingPage")
+        navigator.evict("Dashboard")  # The next login gets a fresh dashboard
+
+    def reset_state(self):
+        """Reloads the table when the cached dashboard is shown again."""
+        self.load_user_expenses()
+
+    def closeEvent(self, event):
+        """Cancels background queries so their results never reach a closed page."""
+        self.sync_timer.stop()
+        self.recurring_timer.stop()
+        self.server_filter_timer.stop()
+        self.chart_panel.stop()
+        self.tasks.cancel_all()
+        super().closeEvent(event)
 
         
 
 
 if __name__ == "__main__":
+    from navigator import get_navigator
+
     app = QApplication(sys.argv)
-    window = Dashboard()
+    window = get_navigator()
+    window.navigate("Dashboard")
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,573 @@
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from backends import MySQLBackend, SQLiteBackend
+import expense_query
+from money import Money
+import recurring
+
+# **Connection Settings**
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "",
+    "database": "expense_tracker"
+}
+SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "expense_tracker.db")
+
+_backend = None
+
+
+def use_backend(backend):
+    """Selects the storage backend every query in this module goes through."""
+    global _backend
+    _backend = backend
+
+
+def backend_from_environment():
+    """Builds the backend named by EXPENSE_TRACKER_BACKEND ('mysql' by default, or 'sqlite')."""
+    if os.environ.get("EXPENSE_TRACKER_BACKEND", "mysql").lower() == "sqlite":
+        return SQLiteBackend(os.environ.get("EXPENSE_TRACKER_SQLITE_PATH", SQLITE_PATH))
+    return MySQLBackend(DB_CONFIG)
+
+
+def get_backend():
+    """Returns the selected backend, falling back to the environment's choice."""
+    global _backend
+    if _backend is None:
+        _backend = backend_from_environment()
+    return _backend
+
+
+def fetch_one(query, params=()):
+    """Runs a prepared SELECT and returns the first row."""
+    backend = get_backend()
+    with backend.connection() as connection:
+        cursor = backend.cursor(connection)
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+
+def fetch_all(query, params=()):
+    """Runs a prepared SELECT and returns every row."""
+    backend = get_backend()
+    with backend.connection() as connection:
+        cursor = backend.cursor(connection)
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+
+@contextmanager
+def transaction(prepared=True):
+    """Yields a cursor whose statements commit together or not at all.
+
+    Pass prepared=False for executemany() batches: the plain MySQL cursor rewrites
+    them into a single multi-row INSERT instead of one round trip per row.
+    """
+    backend = get_backend()
+    with backend.connection() as connection:
+        cursor = backend.cursor(connection, prepared=prepared)
+        try:
+            backend.begin(connection)
+            yield cursor
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+def execute(query, params=()):
+    """Runs a prepared write, commits it and returns the new row id."""
+    with transaction() as cursor:
+        cursor.execute(query, params)
+        return cursor.lastrowid
+
+
+# **Users**
+def get_user_credentials(username):
+    """Returns (id, password_hash) for a username, or None."""
+    return fetch_one("SELECT id, password FROM users WHERE username = %s", (username,))
+
+
+def create_user(username, email, hashed_password):
+    """Inserts a new user and returns its id."""
+    return execute(
+        "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+        (username, email, hashed_password)
+    )
+
+
+def update_password_hash(user_id, hashed_password):
+    """Replaces a user's stored password hash."""
+    execute("UPDATE users SET password = %s WHERE id = %s", (hashed_password, user_id))
+
+
+# **Expenses** - amounts go in and come out as Money; each backend picks the column type
+MAX_EXPENSE_TYPE_LENGTH = 255  # expense_type is varchar(255)
+
+
+def _expense_rows(rows):
+    """Converts the amount of (id, expense_type, amount, created_at) rows to Money."""
+    money = get_backend().money
+    return [(expense_id, expense_type, money(amount), created_at) for expense_id, expense_type, amount, created_at in rows]
+
+
+def fetch_expense_page(user_id, after=None, limit=200):
+    """Returns up to `limit` (id, expense_type, amount, created_at) rows, newest first.
+
+    `after` is the (created_at, id) of the last row already shown; paging on that key
+    walks the (user_id, created_at) index instead of skipping rows like OFFSET does.
+    """
+    if after is None:
+        return _expense_rows(fetch_all("""
+            SELECT id, expense_type, amount, created_at FROM expenses
+            WHERE user_id = %s
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s
+        """, (user_id, limit)))
+
+    created_at, expense_id = after
+    return _expense_rows(fetch_all("""
+        SELECT id, expense_type, amount, created_at FROM expenses
+        WHERE user_id = %s AND (created_at < %s OR (created_at = %s AND id < %s))
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    """, (user_id, created_at, created_at, expense_id, limit)))
+
+
+def fetch_filtered_expense_page(user_id, criteria, after=None, limit=200):
+    """Returns one keyset page of a user's expenses matching an ExpenseFilter, newest first.
+
+    Filtering happens in the database, so large histories are never downloaded
+    just to be thrown away on the client.
+    """
+    known_types = [row[0] for row in fetch_expense_types(user_id)] if criteria.text else ()
+    query = expense_query.build_expense_query(user_id, criteria, known_types, after=after, limit=limit)
+    if query is None:
+        return []
+    sql, params = query
+    return _expense_rows(fetch_all(sql, params))
+
+
+def fetch_expense_types(user_id):
+    """Returns (expense_type,) for every category the user currently has, from the daily rollup."""
+    return fetch_all("""
+        SELECT expense_type FROM expense_daily_rollup
+        WHERE user_id = %s
+        GROUP BY expense_type
+        HAVING SUM(count) > 0
+    """, (user_id,))
+
+
+def stream_user_expenses(user_id, chunk_size=5000):
+    """Yields lists of (id, expense_type, amount, created_at) rows, oldest first.
+
+    Uses an unbuffered cursor so rows stay on the server until fetched; memory is
+    bounded by chunk_size however long the history is.
+    """
+    backend = get_backend()
+    with backend.connection() as connection:
+        cursor = backend.cursor(connection, prepared=False, buffered=False)
+        finished = False
+        try:
+            cursor.execute("""
+                SELECT id, expense_type, amount, created_at FROM expenses
+                WHERE user_id = %s
+                ORDER BY created_at, id
+            """, (user_id,))
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    finished = True
+                    return
+                yield _expense_rows(rows)
+        finally:
+            if not finished:
+                # An abandoned stream must be drained before the connection is reused
+                backend.discard_results(connection)
+            cursor.close()
+
+
+def fetch_expense_version(user_id):
+    """Returns the counter every expense write bumps; caches compare it to spot stale rows."""
+    row = fetch_one("SELECT expense_version FROM users WHERE id = %s", (user_id,))
+    return row[0] if row else 0
+
+
+def count_user_expenses(user_id):
+    """Returns how many expenses a user has, read from the daily rollup."""
+    row = fetch_one("SELECT SUM(count) FROM expense_daily_rollup WHERE user_id = %s", (user_id,))
+    return int(row[0] or 0)
+
+
+def insert_expense(user_id, expense_type, amount, created_at):
+    """Inserts an expense, updates the daily rollup in the same transaction and returns its id."""
+    with transaction() as cursor:
+        cursor.execute(
+            "INSERT INTO expenses (user_id, expense_type, amount, created_at) VALUES (%s, %s, %s, %s)",
+            (user_id, expense_type, amount, created_at)
+        )
+        expense_id = cursor.lastrowid
+        _apply_rollup(cursor, user_id, created_at.date(), expense_type, amount, 1)
+        _apply_budgets(cursor, [(user_id, expense_type, created_at.date(), amount)])
+        _bump_version(cursor, user_id)
+        return expense_id
+
+
+def insert_expenses_batch(user_id, expenses):
+    """Inserts many (expense_type, amount, created_at) rows and their rollup in one transaction.
+
+    Returns the user's new expense_version.
+    """
+    with transaction(prepared=False) as cursor:
+        _insert_expenses(cursor, user_id, expenses)
+        return _bump_version(cursor, user_id)
+
+
+def _insert_expenses(cursor, user_id, expenses):
+    """Writes (expense_type, amount, created_at) rows with their rollup and budget changes."""
+    rollup = {}
+    for expense_type, amount, created_at in expenses:
+        key = (created_at.date(), expense_type)
+        total, count = rollup.get(key, (Money(), 0))
+        rollup[key] = (total + amount, count + 1)
+
+    cursor.executemany(
+        "INSERT INTO expenses (user_id, expense_type, amount, created_at) VALUES (%s, %s, %s, %s)",
+        [(user_id, expense_type, amount, created_at) for expense_type, amount, created_at in expenses]
+    )
+    cursor.executemany(_rollup_upsert(), [(user_id, day, expense_type, total, count) for (day, expense_type), (total, count) in rollup.items()])
+    _apply_budgets(cursor, [(user_id, expense_type, day, total) for (day, expense_type), (total, _) in rollup.items()])
+
+
+def apply_queued_expenses(entries):
+    """Stores (client_key, user_id, expense_type, amount, created_at) entries exactly once.
+
+    Entries whose client_key is already on the server (a batch that committed but
+    whose acknowledgement was lost) are skipped, so retries never double-count.
+    Returns ({client_key: expense_id} for every entry, {user_id: new expense_version}).
+    """
+    keys = [entry[0] for entry in entries]
+    key_list = ", ".join(["%s"] * len(keys))
+
+    with transaction(prepared=False) as cursor:
+        cursor.execute(f"SELECT client_key FROM expenses WHERE client_key IN ({key_list})", keys)
+        applied = {row[0] for row in cursor.fetchall()}
+        new_entries = [entry for entry in entries if entry[0] not in applied]
+
+        rollup = {}
+        for _, user_id, expense_type, amount, created_at in new_entries:
+            key = (user_id, created_at.date(), expense_type)
+            total, count = rollup.get(key, (Money(), 0))
+            rollup[key] = (total + amount, count + 1)
+
+        if new_entries:
+            cursor.executemany(
+                "INSERT INTO expenses (client_key, user_id, expense_type, amount, created_at) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                new_entries
+            )
+            cursor.executemany(_rollup_upsert(), [
+                (user_id, day, expense_type, total, count)
+                for (user_id, day, expense_type), (total, count) in rollup.items()
+            ])
+            _apply_budgets(cursor, [
+                (user_id, expense_type, day, total) for (user_id, day, expense_type), (total, _) in rollup.items()
+            ])
+
+        # Bumped once per user per call, even on a retry, so caches can tell our write from others'
+        versions = {user_id: _bump_version(cursor, user_id) for user_id in sorted({entry[1] for entry in entries})}
+
+        cursor.execute(f"SELECT client_key, id FROM expenses WHERE client_key IN ({key_list})", keys)
+        return dict(cursor.fetchall()), versions
+
+
+def update_expense(user_id, expense_id, expense_type, amount):
+    """Updates a single expense by primary key (user_id guards against other users' rows).
+
+    Returns the user's new expense_version, or None if the expense was not found.
+    """
+    with transaction() as cursor:
+        old = _lock_expense(cursor, user_id, expense_id)
+        if old is None:
+            return
+        old_type, old_amount, created_at = old
+
+        cursor.execute(
+            "UPDATE expenses SET expense_type = %s, amount = %s WHERE id = %s AND user_id = %s",
+            (expense_type, amount, expense_id, user_id)
+        )
+        _apply_rollup(cursor, user_id, created_at.date(), old_type, -old_amount, -1)
+        _apply_rollup(cursor, user_id, created_at.date(), expense_type, amount, 1)
+        _apply_budgets(cursor, [
+            (user_id, old_type, created_at.date(), -old_amount),
+            (user_id, expense_type, created_at.date(), amount)
+        ])
+        return _bump_version(cursor, user_id)
+
+
+def delete_expense(user_id, expense_id):
+    """Deletes a single expense by primary key and takes it out of the daily rollup.
+
+    Returns the user's new expense_version, or None if the expense was not found.
+    """
+    with transaction() as cursor:
+        old = _lock_expense(cursor, user_id, expense_id)
+        if old is None:
+            return
+        old_type, old_amount, created_at = old
+
+        cursor.execute("DELETE FROM expenses WHERE id = %s AND user_id = %s", (expense_id, user_id))
+        _apply_rollup(cursor, user_id, created_at.date(), old_type, -old_amount, -1)
+        _apply_budgets(cursor, [(user_id, old_type, created_at.date(), -old_amount)])
+        return _bump_version(cursor, user_id)
+
+
+def _lock_expense(cursor, user_id, expense_id):
+    """Reads and row-locks an expense's (expense_type, amount, created_at) before changing it."""
+    cursor.execute(
+        "SELECT expense_type, amount, created_at FROM expenses WHERE id = %s AND user_id = %s"
+        + get_backend().lock_clause,
+        (expense_id, user_id)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    expense_type, amount, created_at = row
+    return expense_type, get_backend().money(amount), created_at
+
+
+def _bump_version(cursor, user_id):
+    """Advances a user's expense_version inside the write's transaction and returns it."""
+    cursor.execute("UPDATE users SET expense_version = expense_version + 1 WHERE id = %s", (user_id,))
+    cursor.execute("SELECT expense_version FROM users WHERE id = %s", (user_id,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _apply_rollup(cursor, user_id, day, expense_type, amount, count):
+    """Adds amount/count to one (user, day, type) bucket of expense_daily_rollup."""
+    cursor.execute(_rollup_upsert(), (user_id, day, expense_type, amount, count))
+
+
+def _rollup_upsert():
+    return get_backend().upsert_increment(
+        "expense_daily_rollup",
+        ("user_id", "day", "expense_type", "total", "count"),
+        key_columns=("user_id", "day", "expense_type"),
+        increment_columns=("total", "count")
+    )
+
+
+def _apply_budgets(cursor, changes):
+    """Adds (user_id, expense_type, day, amount) changes to the matching budgets' running counters.
+
+    At most one primary-key UPDATE per category and month, so keeping budgets
+    current never re-reads the month's expenses. A counter only moves forward
+    in time, and never past the current month: a change in an earlier month or
+    a future-dated one is ignored, and the first change in a new month restarts
+    the counter from that month's rollup (already updated by the caller), which
+    also counts any expenses dated into it ahead of time.
+    """
+    current = month_start(date.today())
+    totals = {}
+    for user_id, expense_type, day, amount in changes:
+        key = (user_id, expense_type, month_start(day))
+        if key[2] <= current:
+            totals[key] = totals.get(key, Money()) + amount
+
+    if len(totals) > 2:
+        # Imports touch many months and categories; only update the ones with a budget
+        user_ids = sorted({key[0] for key in totals})
+        cursor.execute(
+            f"SELECT user_id, expense_type FROM budgets WHERE user_id IN ({', '.join(['%s'] * len(user_ids))})",
+            user_ids
+        )
+        budgeted = {tuple(row) for row in cursor.fetchall()}
+        totals = {key: amount for key, amount in totals.items() if key[:2] in budgeted}
+    if not totals:
+        return
+
+    cursor.executemany("""
+        UPDATE budgets SET
+            spent = CASE
+                WHEN month = %s THEN spent + %s
+                WHEN month < %s THEN (
+                    SELECT COALESCE(SUM(total), 0) FROM expense_daily_rollup
+                    WHERE user_id = budgets.user_id AND expense_type = budgets.expense_type AND day >= %s AND day < %s
+                )
+                ELSE spent END,
+            month = CASE WHEN month < %s THEN %s ELSE month END
+        WHERE user_id = %s AND expense_type = %s
+    """, [
+        (month, amount, month, month, month_start(month + timedelta(days=31)), month, month, user_id, expense_type)
+        for (user_id, expense_type, month), amount in totals.items()
+    ])
+
+
+# **Budgets**
+def month_start(day):
+    """Returns the first day of a date's month."""
+    return day.replace(day=1)
+
+
+def fetch_budgets(user_id):
+    """Returns (expense_type, monthly_limit, month, spent) for each of a user's budgets."""
+    money = get_backend().money
+    rows = fetch_all(
+        "SELECT expense_type, monthly_limit, month, spent FROM budgets WHERE user_id = %s ORDER BY expense_type",
+        (user_id,)
+    )
+    return [(expense_type, money(limit), month, money(spent)) for expense_type, limit, month, spent in rows]
+
+
+def set_budget(user_id, expense_type, monthly_limit):
+    """Creates or replaces a category's monthly budget and returns its fetch_budgets() row.
+
+    The counter starts from this month's rollup, read with a lock so an expense
+    written at the same moment is counted exactly once.
+    """
+    month = month_start(date.today())
+    next_month = month_start(month + timedelta(days=31))
+    backend = get_backend()
+    with transaction() as cursor:
+        cursor.execute(
+            "SELECT SUM(total) FROM expense_daily_rollup "
+            "WHERE user_id = %s AND expense_type = %s AND day >= %s AND day < %s" + backend.lock_clause,
+            (user_id, expense_type, month, next_month)
+        )
+        spent = backend.money(cursor.fetchone()[0]) or Money()
+        cursor.execute("DELETE FROM budgets WHERE user_id = %s AND expense_type = %s", (user_id, expense_type))
+        cursor.execute(
+            "INSERT INTO budgets (user_id, expense_type, monthly_limit, month, spent) VALUES (%s, %s, %s, %s, %s)",
+            (user_id, expense_type, monthly_limit, month, spent)
+        )
+    return expense_type, monthly_limit, month, spent
+
+
+def delete_budget(user_id, expense_type):
+    """Removes a category's budget."""
+    execute("DELETE FROM budgets WHERE user_id = %s AND expense_type = %s", (user_id, expense_type))
+
+
+# **Recurring Expenses**
+def fetch_recurring(user_id):
+    """Returns (id, expense_type, amount, frequency, start_date, next_run) for each of a user's templates."""
+    money = get_backend().money
+    rows = fetch_all(
+        "SELECT id, expense_type, amount, frequency, start_date, next_run FROM recurring_expenses "
+        "WHERE user_id = %s ORDER BY next_run, id",
+        (user_id,)
+    )
+    return [
+        (template_id, expense_type, money(amount), frequency, start_date, next_run)
+        for template_id, expense_type, amount, frequency, start_date, next_run in rows
+    ]
+
+
+def add_recurring(user_id, expense_type, amount, frequency, start_date):
+    """Saves a template whose first occurrence is `start_date` and returns its id."""
+    return execute(
+        "INSERT INTO recurring_expenses (user_id, expense_type, amount, frequency, start_date, next_run) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        (user_id, expense_type, amount, frequency, start_date, start_date)
+    )
+
+
+def delete_recurring(user_id, template_id):
+    """Stops a template; expenses it already wrote stay."""
+    execute("DELETE FROM recurring_expenses WHERE id = %s AND user_id = %s", (template_id, user_id))
+
+
+def fetch_next_recurring_run(user_id):
+    """Returns the earliest next_run of a user's templates, or None; one probe of the user_next_run key."""
+    row = fetch_one(
+        "SELECT next_run FROM recurring_expenses WHERE user_id = %s ORDER BY next_run LIMIT 1", (user_id,)
+    )
+    return row[0] if row else None
+
+
+def materialize_recurring(user_id, today):
+    """Writes every occurrence of a user's templates due up to `today` and advances their next_run.
+
+    However long the app was closed, the catch-up is one transaction with one
+    multi-row INSERT. The due templates are read through the (user_id, next_run)
+    key and locked, so two devices never write the same occurrence.
+    Returns (number of expenses written, new expense_version or None).
+    """
+    with transaction(prepared=False) as cursor:
+        cursor.execute(
+            "SELECT id, expense_type, amount, frequency, start_date, next_run FROM recurring_expenses "
+            "WHERE user_id = %s AND next_run <= %s" + get_backend().lock_clause,
+            (user_id, today)
+        )
+        templates = cursor.fetchall()
+        if not templates:
+            return 0, None
+
+        money = get_backend().money
+        expenses = []
+        next_runs = []
+        for template_id, expense_type, amount, frequency, start_date, next_run in templates:
+            dates, next_run = recurring.due_dates(next_run, frequency, start_date.day, today)
+            expenses.extend((expense_type, money(amount), datetime.combine(day, time.min)) for day in dates)
+            next_runs.append((next_run, template_id))
+
+        _insert_expenses(cursor, user_id, expenses)
+        cursor.executemany("UPDATE recurring_expenses SET next_run = %s WHERE id = %s", next_runs)
+        return len(expenses), _bump_version(cursor, user_id)
+
+
+# **Reporting**
+def fetch_totals_by_type(user_id):
+    """Returns (expense_type, total, count) per category, largest first, from the daily rollup."""
+    money = get_backend().money
+    rows = fetch_all("""
+        SELECT expense_type, SUM(total), SUM(count) FROM expense_daily_rollup
+        WHERE user_id = %s
+        GROUP BY expense_type
+        HAVING SUM(count) > 0
+        ORDER BY SUM(total) DESC
+    """, (user_id,))
+    return [(expense_type, money(total), count) for expense_type, total, count in rows]
+
+
+def fetch_totals_by_month(user_id):
+    """Returns (year, month, total) per calendar month, newest first, from the daily rollup."""
+    backend = get_backend()
+    year, month = backend.year("day"), backend.month("day")
+    rows = fetch_all(f"""
+        SELECT {year}, {month}, SUM(total) FROM expense_daily_rollup
+        WHERE user_id = %s
+        GROUP BY {year}, {month}
+        HAVING SUM(count) > 0
+        ORDER BY {year} DESC, {month} DESC
+    """, (user_id,))
+    return [(row_year, row_month, backend.money(total)) for row_year, row_month, total in rows]
+
+
+def fetch_daily_spending(user_id, criteria):
+    """Returns (day, total) for each day with expenses matching an ExpenseFilter's types and dates."""
+    known_types = [row[0] for row in fetch_expense_types(user_id)] if criteria.text else ()
+    query = expense_query.build_spending_query(user_id, criteria, known_types)
+    if query is None:
+        return []
+    sql, params = query
+    money = get_backend().money
+    return [(day, money(total)) for day, total in fetch_all(sql, params)]
+
+
+def fetch_summary(user_id):
+    """Returns both summary breakdowns in one worker round trip."""
+    return {
+        "by_type": fetch_totals_by_type(user_id),
+        "by_month": fetch_totals_by_month(user_id)
+    }
@@ -0,0 +1,70 @@
+def lttb(points, threshold):
+    """Reduces (x, y) points, sorted by x, to `threshold` points with Largest-Triangle-Three-Buckets.
+
+    Each bucket keeps the point forming the largest triangle with the point kept
+    before it and the average of the next bucket, so spikes survive where plain
+    averaging or every-nth sampling would flatten them.
+    """
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (count - 2) / (threshold - 2)
+    kept = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+
+        following = points[end:next_end] or points[-1:]
+        average_x = sum(x for x, _ in following) / len(following)
+        average_y = sum(y for _, y in following) / len(following)
+
+        kept_x, kept_y = points[kept]
+        best_area = -1
+        for i in range(start, end):
+            x, y = points[i]
+            area = abs((kept_x - average_x) * (y - kept_y) - (kept_x - x) * (average_y - kept_y))
+            if area > best_area:
+                best_area = area
+                best = i
+        sampled.append(points[best])
+        kept = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def min_max(points, x_start, x_end, columns):
+    """Keeps the lowest and highest point per pixel column, in x order.
+
+    A polyline through these looks the same as one through every point, but
+    never has more than two vertices per column of the plot.
+    """
+    if len(points) <= 2 * columns or x_end <= x_start:
+        return list(points)
+
+    scale = columns / (x_end - x_start)
+    kept = []
+    column = low = high = None
+    for point in points:
+        index = min(int((point[0] - x_start) * scale), columns - 1)
+        if index != column:
+            _keep(kept, low, high)
+            column, low, high = index, point, point
+        elif point[1] < low[1]:
+            low = point
+        elif point[1] > high[1]:
+            high = point
+    _keep(kept, low, high)
+    return kept
+
+
+def _keep(kept, low, high):
+    if low is None:
+        return
+    if low is high:
+        kept.append(low)
+    else:
+        kept.extend((low, high) if low[0] < high[0] else (high, low))
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+
+MAX_CACHED_USERS = 4
+MAX_CACHED_ROWS = 200000
+
+_cache = None
+
+
+class CachedExpenses:
+    """One user's expenses as last read from the server, tagged with users.expense_version."""
+
+    def __init__(self, version):
+        self.version = version
+        self.rows = []  # (id, expense_type, amount, created_at), newest first
+        self.after = None
+        self.exhausted = False
+        self.summary = None
+        self.insights = None
+        self.outliers = None  # (version, outliers); kept across writes, see InsightsPanel
+
+
+class ExpenseCache:
+    """Keeps recently viewed users' expenses in memory between dashboard visits.
+
+    The dashboard writes its own changes through to the cache. Every write on the
+    server bumps the user's expense_version, so an entry whose version no longer
+    matches was changed somewhere else (an import, another device) and is dropped.
+    Entries are evicted least recently used first once too many rows are held.
+    Only used from the GUI thread.
+    """
+
+    def __init__(self, max_users=MAX_CACHED_USERS, max_rows=MAX_CACHED_ROWS):
+        self.max_users = max_users
+        self.max_rows = max_rows
+        self._entries = OrderedDict()
+
+    def get(self, user_id):
+        """Returns a user's cached expenses, or None."""
+        user_id = int(user_id)  # QSettings may hand back the id as a string
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            self._entries.move_to_end(user_id)
+        return entry
+
+    def begin(self, user_id, version):
+        """Starts a fresh entry for a user whose first page is being read at `version`."""
+        user_id = int(user_id)
+        entry = CachedExpenses(version)
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        self._trim()
+        return entry
+
+    def add_page(self, user_id, page, after, exhausted):
+        """Appends a keyset page the table just loaded; past max_rows the table pages from the server."""
+        entry = self._entries.get(int(user_id))
+        if entry is None or len(entry.rows) + len(page) > self.max_rows:
+            return
+        entry.rows.extend(page)
+        entry.after = after
+        entry.exhausted = exhausted
+        self._trim()
+
+    def invalidate(self, user_id):
+        """Forgets a user's cached expenses."""
+        self._entries.pop(int(user_id), None)
+
+    def validate(self, user_id, version):
+        """Drops the entry if the server's version moved on; returns whether it is still current."""
+        entry = self._entries.get(int(user_id))
+        if entry is None or entry.version != version:
+            self.invalidate(user_id)
+            return False
+        return True
+
+    # **Write-Through**
+    def _advance(self, user_id, version):
+        """Returns the entry a write may patch, or None once someone else has written too."""
+        entry = self._entries.get(int(user_id))
+        if entry is None:
+            return None
+        if version is None or version != entry.version + 1:
+            self.invalidate(user_id)
+            return None
+        entry.version = version
+        entry.summary = None  # Summary totals are re-read from the rollup
+        entry.insights = None
+        return entry
+
+    def add(self, user_id, expenses, version):
+        """Records expenses that reached the server in one write."""
+        entry = self._advance(user_id, version)
+        if entry is not None:
+            entry.rows[0:0] = sorted((tuple(expense) for expense in expenses), key=lambda row: (row[3], row[0]), reverse=True)
+            self._trim()
+
+    def update(self, user_id, expense_id, expense_type, amount, version):
+        """Records an edited expense."""
+        entry = self._advance(user_id, version)
+        if entry is None:
+            return
+        for i, row in enumerate(entry.rows):
+            if row[0] == expense_id:
+                entry.rows[i] = (expense_id, expense_type, amount, row[3])
+                return
+
+    def remove(self, user_id, expense_id, version):
+        """Records a deleted expense."""
+        entry = self._advance(user_id, version)
+        if entry is None:
+            return
+        entry.rows = [row for row in entry.rows if row[0] != expense_id]
+
+    def _trim(self):
+        """Evicts the least recently used users; the most recent one is always kept."""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_users
+            or sum(len(entry.rows) for entry in self._entries.values()) > self.max_rows
+        ):
+            self._entries.popitem(last=False)
+
+
+def get_expense_cache():
+    """Returns the app-wide expense cache."""
+    global _cache
+    if _cache is None:
+        _cache = ExpenseCache()
+    return _cache
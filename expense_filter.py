@@ -0,0 +1,382 @@
+import bisect
+from PyQt6.QtCore import Qt, QAbstractProxyModel, QModelIndex
+from expense_query import ExpenseFilter, tokenize
+
+TYPE_COLUMN = 0
+AMOUNT_COLUMN = 1
+DATE_COLUMN = 2
+SORTABLE_COLUMNS = (TYPE_COLUMN, AMOUNT_COLUMN, DATE_COLUMN)
+
+
+def _insert(keys, ids, key, expense_id):
+    position = bisect.bisect_right(keys, key)
+    keys.insert(position, key)
+    ids.insert(position, expense_id)
+
+
+def _delete(keys, ids, key, expense_id):
+    lo = bisect.bisect_left(keys, key)
+    hi = bisect.bisect_right(keys, key)
+    position = ids.index(expense_id, lo, hi)
+    del keys[position]
+    del ids[position]
+
+
+def _without(keys, ids, rows):
+    """Filters parallel sorted arrays down to the ids still in `rows`, keeping their order."""
+    kept = [position for position, expense_id in enumerate(ids) if expense_id in rows]
+    return [keys[position] for position in kept], [ids[position] for position in kept]
+
+
+def _sorted_pairs(rows, field):
+    pairs = sorted(((row[field], expense_id) for expense_id, row in rows.items()), key=lambda pair: pair[0])
+    return [key for key, _ in pairs], [expense_id for _, expense_id in pairs]
+
+
+class ExpenseIndex:
+    """Per-column lookups over the loaded expenses, keyed by expense id.
+
+    Amounts and dates are kept as sorted arrays, so a range is two bisects, and
+    expense types as token -> ids sets, so a search never scans every row. Ids
+    are used instead of row numbers because rows shift as expenses are added.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.rows = {}  # id -> (expense_type, amount, created_at)
+        self._amount_keys, self._amount_ids = [], []
+        self._date_keys, self._date_ids = [], []
+        self._types = {}
+        self._tokens = {}
+        self._type_order = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    # **Maintenance**
+    def add_many(self, expenses):
+        """Indexes (id, expense_type, amount, created_at) rows."""
+        expenses = list(expenses)
+        if len(expenses) > len(self.rows) // 8:
+            # Re-sorting once beats thousands of list inserts
+            for expense_id, expense_type, amount, created_at in expenses:
+                self.rows[expense_id] = (expense_type, amount, created_at)
+                self._index_type(expense_id, expense_type)
+            self._amount_keys, self._amount_ids = _sorted_pairs(self.rows, 1)
+            self._date_keys, self._date_ids = _sorted_pairs(self.rows, 2)
+            self._type_order = None
+            return
+        for expense in expenses:
+            self.add(expense)
+
+    def add(self, expense):
+        expense_id, expense_type, amount, created_at = expense
+        self.rows[expense_id] = (expense_type, amount, created_at)
+        _insert(self._amount_keys, self._amount_ids, amount, expense_id)
+        _insert(self._date_keys, self._date_ids, created_at, expense_id)
+        self._index_type(expense_id, expense_type)
+        self._type_order = None
+
+    def remove(self, expense_id):
+        row = self.rows.pop(expense_id, None)
+        if row is None:
+            return
+        expense_type, amount, created_at = row
+        _delete(self._amount_keys, self._amount_ids, amount, expense_id)
+        _delete(self._date_keys, self._date_ids, created_at, expense_id)
+        self._unindex_type(expense_id, expense_type)
+        self._type_order = None
+
+    def remove_many(self, expense_ids):
+        """Drops many expenses at once, e.g. every paged row when paging restarts."""
+        expense_ids = [expense_id for expense_id in expense_ids if expense_id in self.rows]
+        if len(expense_ids) <= len(self.rows) // 8:
+            for expense_id in expense_ids:
+                self.remove(expense_id)
+            return
+
+        if len(expense_ids) * 2 >= len(self.rows):
+            # Most rows are going: re-index the few that stay instead
+            removed = set(expense_ids)
+            kept = [(expense_id,) + row for expense_id, row in self.rows.items() if expense_id not in removed]
+            self.clear()
+            self.add_many(kept)
+            return
+
+        # One filtering pass over the sorted arrays instead of a list.index() and del per row
+        for expense_id in expense_ids:
+            self._unindex_type(expense_id, self.rows.pop(expense_id)[0])
+        self._amount_keys, self._amount_ids = _without(self._amount_keys, self._amount_ids, self.rows)
+        self._date_keys, self._date_ids = _without(self._date_keys, self._date_ids, self.rows)
+        self._type_order = None
+
+    def update(self, expense):
+        self.remove(expense[0])
+        self.add(expense)
+
+    def rename(self, old_id, new_id):
+        """Re-keys an expense whose provisional id was swapped for the server's."""
+        row = self.rows.get(old_id)
+        if row is not None:
+            self.remove(old_id)
+            self.add((new_id,) + row)
+
+    def _unindex_type(self, expense_id, expense_type):
+        for lookup, keys in ((self._types, [expense_type]), (self._tokens, set(tokenize(expense_type)))):
+            for key in keys:
+                ids = lookup.get(key)
+                if ids is not None:
+                    ids.discard(expense_id)
+                    if not ids:
+                        del lookup[key]
+
+    def _index_type(self, expense_id, expense_type):
+        self._types.setdefault(expense_type, set()).add(expense_id)
+        for token in set(tokenize(expense_type)):
+            self._tokens.setdefault(token, set()).add(expense_id)
+
+    # **Queries**
+    def _matches(self, criteria):
+        """Yields one id set per active criterion."""
+        for query_token in tokenize(criteria.text):
+            ids = set()
+            for token, token_ids in self._tokens.items():
+                if token.startswith(query_token):
+                    ids |= token_ids
+            yield ids
+
+        if criteria.types is not None:
+            ids = set()
+            for expense_type in criteria.types:
+                ids |= self._types.get(expense_type, set())
+            yield ids
+
+        if criteria.min_amount is not None or criteria.max_amount is not None:
+            yield self._range(self._amount_keys, self._amount_ids, criteria.min_amount, criteria.max_amount, True)
+
+        if criteria.date_from is not None or criteria.date_to is not None:
+            yield self._range(self._date_keys, self._date_ids, criteria.date_from, criteria.date_to, False)
+
+    def _range(self, keys, ids, low, high, inclusive_high):
+        lo = 0 if low is None else bisect.bisect_left(keys, low)
+        if high is None:
+            hi = len(keys)
+        else:
+            hi = bisect.bisect_right(keys, high) if inclusive_high else bisect.bisect_left(keys, high)
+        return set(ids[lo:hi])
+
+    def _order(self, column):
+        """Returns every id in ascending order of a column."""
+        if column == AMOUNT_COLUMN:
+            return self._amount_ids
+        if column == TYPE_COLUMN:
+            if self._type_order is None:
+                # Bucket the date order by type: sorted by type, then date, without a full sort
+                by_type = {}
+                for expense_id in self._date_ids:
+                    by_type.setdefault(self.rows[expense_id][0], []).append(expense_id)
+                self._type_order = [
+                    expense_id
+                    for expense_type in sorted(by_type, key=lambda expense_type: (expense_type or "").lower())
+                    for expense_id in by_type[expense_type]
+                ]
+            return self._type_order
+        return self._date_ids
+
+    def _sort_key(self, column):
+        rows = self.rows
+        if column == AMOUNT_COLUMN:
+            return lambda expense_id: rows[expense_id][1]
+        if column == TYPE_COLUMN:
+            return lambda expense_id: ((rows[expense_id][0] or "").lower(), rows[expense_id][2])
+        return lambda expense_id: rows[expense_id][2]
+
+    def select(self, criteria, column=DATE_COLUMN, descending=True):
+        """Returns the ids matching `criteria`, sorted by a column."""
+        candidates = None
+        for ids in sorted(self._matches(criteria), key=len):
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        order = self._order(column)
+        if candidates is None:
+            selected = list(order)
+        elif len(candidates) * 128 < len(order):
+            selected = sorted(candidates, key=self._sort_key(column))  # Few matches: sort just those
+        else:
+            selected = [expense_id for expense_id in order if expense_id in candidates]
+
+        if descending:
+            selected.reverse()
+        return selected
+
+
+class ExpenseFilterProxy(QAbstractProxyModel):
+    """Filters and sorts an ExpenseTableModel through an ExpenseIndex.
+
+    QSortFilterProxyModel calls filterAcceptsRow() for every row and lessThan()
+    for every comparison, which from Python is too slow to run per keystroke on
+    large tables. This proxy asks the index for the matching ids instead and
+    only maps the rows the view paints. Paging still goes through the source
+    model, so filters apply to the rows loaded so far.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.expense_index = ExpenseIndex()
+        self.criteria = ExpenseFilter()
+        self.sort_column = DATE_COLUMN
+        self.sort_order = Qt.SortOrder.DescendingOrder
+        self._ids = []
+        self._row_by_id = None
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.modelReset.connect(self._rebuild)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(lambda parent, first, last: self._refilter())
+        model.dataChanged.connect(self._on_data_changed)
+        model.id_replaced.connect(self._on_id_replaced)
+        self._rebuild()
+
+    # **Filtering**
+    def set_filter(self, criteria):
+        """Applies new filter criteria."""
+        self.criteria = criteria
+        self._refilter()
+
+    def is_filtered(self):
+        return not self.criteria.is_empty()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if column not in SORTABLE_COLUMNS:
+            return
+        self.sort_column = column
+        self.sort_order = order
+        self._refilter()
+
+    def _refilter(self):
+        """Re-runs the query and tells the view about the smallest change that explains it."""
+        new_ids = self.expense_index.select(
+            self.criteria, self.sort_column, self.sort_order == Qt.SortOrder.DescendingOrder
+        )
+        old_ids = self._ids
+        if new_ids == old_ids:
+            return
+
+        shorter = min(len(old_ids), len(new_ids))
+        prefix = 0
+        while prefix < shorter and old_ids[prefix] == new_ids[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < shorter - prefix and old_ids[-1 - suffix] == new_ids[-1 - suffix]:
+            suffix += 1
+
+        if prefix + suffix == len(old_ids):
+            self.beginInsertRows(QModelIndex(), prefix, prefix + len(new_ids) - len(old_ids) - 1)
+            self._set_ids(new_ids)
+            self.endInsertRows()
+        elif prefix + suffix == len(new_ids):
+            self.beginRemoveRows(QModelIndex(), prefix, prefix + len(old_ids) - len(new_ids) - 1)
+            self._set_ids(new_ids)
+            self.endRemoveRows()
+        else:
+            self.beginResetModel()
+            self._set_ids(new_ids)
+            self.endResetModel()
+
+    def _set_ids(self, ids):
+        self._ids = ids
+        self._row_by_id = None
+
+    def _proxy_row(self, expense_id):
+        if self._row_by_id is None:
+            self._row_by_id = {expense_id: row for row, expense_id in enumerate(self._ids)}
+        return self._row_by_id.get(expense_id)
+
+    # **Source Changes**
+    def _rebuild(self):
+        model = self.sourceModel()
+        self.expense_index.clear()
+        self.expense_index.add_many(model.expense_at(row) for row in range(model.rowCount()))
+        self.beginResetModel()
+        self._set_ids(self.expense_index.select(
+            self.criteria, self.sort_column, self.sort_order == Qt.SortOrder.DescendingOrder
+        ))
+        self.endResetModel()
+
+    def _on_rows_inserted(self, parent, first, last):
+        model = self.sourceModel()
+        self.expense_index.add_many(model.expense_at(row) for row in range(first, last + 1))
+        self._refilter()
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        model = self.sourceModel()
+        self.expense_index.remove_many(model.expense_at(row)[0] for row in range(first, last + 1))
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        model = self.sourceModel()
+        changed = [model.expense_at(row) for row in range(top_left.row(), bottom_right.row() + 1)]
+        for expense in changed:
+            self.expense_index.update(expense)
+        self._refilter()
+
+        for expense in changed:
+            row = self._proxy_row(expense[0])
+            if row is not None:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def _on_id_replaced(self, old_id, new_id):
+        self.expense_index.rename(old_id, new_id)
+        row = self._proxy_row(old_id)
+        if row is not None:
+            self._ids[row] = new_id
+            self._row_by_id = None
+
+    # **Proxy Mapping**
+    def expense_at(self, row):
+        """Returns the (id, expense_type, amount, created_at) tuple shown in a proxy row."""
+        model = self.sourceModel()
+        return model.expense_at(model.row_of(self._ids[row]))
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._ids)) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()  # QObject.parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        model = self.sourceModel()
+        row = model.row_of(self._ids[proxy_index.row()])
+        if row is None:
+            return QModelIndex()
+        return model.index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = self._proxy_row(self.sourceModel().expense_at(source_index.row())[0])
+        if row is None:
+            return QModelIndex()
+        return self.index(row, source_index.column())
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        return None
@@ -0,0 +1,324 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, pyqtSignal
+import database
+from expense_cache import get_expense_cache
+
+HEADERS = ["Expense Type", "Amount (₱)", "Date", "Actions"]
+ACTIONS_COLUMN = 3
+PAGE_SIZE = 200
+
+
+def _first_page(user_id, limit):
+    """Reads the version before the page, so a write racing the read leaves the cache stale, not wrong."""
+    version = database.fetch_expense_version(user_id)
+    return version, database.fetch_expense_page(user_id, None, limit)
+
+
+class ExpenseTableModel(QAbstractTableModel):
+    """Holds the user's expenses as plain tuples so the view only paints visible rows.
+
+    Rows are (id, expense_type, amount, created_at), newest first. History is pulled
+    in keyset pages as the view scrolls; expenses added this session sit above them.
+    Pages are kept in the shared expense cache, so a repeat visit shows them at once
+    and only checks the user's expense_version with the server. With a server-side
+    filter set, pages come from a filtered query instead and bypass the cache.
+    """
+
+    loading_changed = pyqtSignal(bool)
+    load_failed = pyqtSignal(object)
+    cache_invalidated = pyqtSignal()
+    id_replaced = pyqtSignal(object, object)
+
+    def __init__(self, tasks, parent=None):
+        super().__init__(parent)
+        self.tasks = tasks
+        self.user_id = None
+        self.criteria = None  # ExpenseFilter applied by the database, or None for everything
+        self._added = []  # Expenses added this session, oldest first (shown reversed on top)
+        self._rows = []   # Pages fetched from the database, newest first
+        self._position = {}
+        self._after = None
+        self._exhausted = True
+        self._loading = False
+        self._generation = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._added) + len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        _, expense_type, amount, created_at = self.expense_at(index.row())
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return expense_type
+            if column == 1:
+                return f"₱{amount:.2f}"
+            if column == 2:
+                return created_at.strftime("%Y-%m-%d %H:%M")
+        elif role == Qt.ItemDataRole.UserRole:
+            return (expense_type, amount, created_at)[column] if column < ACTIONS_COLUMN else None
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HEADERS[section]
+        return None
+
+    # **Lazy Loading**
+    def start(self, user_id):
+        """Clears the table and shows a user's expenses, from the cache when it has them."""
+        entry = get_expense_cache().get(user_id) if self.criteria is None else None
+
+        self.beginResetModel()
+        self.user_id = user_id
+        self._added = []
+        self._rows = []
+        self._position = {}
+        self._after = None
+        self._exhausted = False
+        self._loading = False
+        self._generation += 1
+        if entry is not None:
+            self._rows = list(entry.rows)
+            self._reindex(self._rows, "paged", 0)
+            self._after = entry.after
+            self._exhausted = entry.exhausted
+        self.endResetModel()
+
+        if entry is None:
+            self.fetchMore(QModelIndex())
+            return
+
+        generation = self._generation
+        self.tasks.run(
+            database.fetch_expense_version, user_id,
+            on_success=lambda version: self._on_version_checked(generation, version)
+        )  # Offline, the cached rows simply stay on screen
+
+    def _on_version_checked(self, generation, version):
+        if generation != self._generation or get_expense_cache().validate(self.user_id, version):
+            return
+        # Written elsewhere since it was cached: read the pages again
+        self.cache_invalidated.emit()
+        self._restart_paging()
+
+    def set_server_filter(self, criteria):
+        """Re-pages the history through a filtered query (None or an empty filter pages everything)."""
+        self.criteria = None if criteria is None or criteria.is_empty() else criteria
+        if self.user_id is not None:
+            self._restart_paging()
+
+    def is_complete(self):
+        """True once every row the current query can return is loaded."""
+        return self._exhausted
+
+    def _restart_paging(self):
+        """Replaces the paged rows, keeping this session's additions, and pages again."""
+        if self._rows:
+            first = len(self._added)
+            self.beginRemoveRows(QModelIndex(), first, first + len(self._rows) - 1)
+            for expense in self._rows:
+                self._position.pop(expense[0], None)
+            self._rows = []
+            self.endRemoveRows()
+        self._after = None
+        self._exhausted = False
+        self._loading = False
+        self._generation += 1
+
+        entry = get_expense_cache().get(self.user_id) if self.criteria is None else None
+        if entry is None:
+            self.fetchMore(QModelIndex())
+            return
+
+        rows = [expense for expense in entry.rows if expense[0] not in self._position]
+        self._after = entry.after
+        self._exhausted = entry.exhausted
+        if rows:
+            first = self.rowCount()
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows = rows
+            self._reindex(self._rows, "paged", 0)
+            self.endInsertRows()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Requests the page after the oldest row loaded so far."""
+        if not self.canFetchMore(parent):
+            return
+
+        generation = self._generation
+        self._set_loading(True)
+        if self.criteria is not None:
+            self.tasks.run(
+                database.fetch_filtered_expense_page, self.user_id, self.criteria, self._after, PAGE_SIZE,
+                on_success=lambda page: self._on_page_loaded(generation, page),
+                on_error=lambda error: self._on_page_failed(generation, error)
+            )
+            return
+
+        if self._after is None:
+            self.tasks.run(
+                _first_page, self.user_id, PAGE_SIZE,
+                on_success=lambda result: self._on_page_loaded(generation, result[1], result[0]),
+                on_error=lambda error: self._on_page_failed(generation, error)
+            )
+            return
+
+        self.tasks.run(
+            database.fetch_expense_page, self.user_id, self._after, PAGE_SIZE,
+            on_success=lambda page: self._on_page_loaded(generation, page),
+            on_error=lambda error: self._on_page_failed(generation, error)
+        )
+
+    def _on_page_loaded(self, generation, page, version=None):
+        if generation != self._generation:
+            return  # A page for a previous user or reset
+
+        cache = get_expense_cache()
+        if version is not None:
+            cache.begin(self.user_id, version)
+
+        self._set_loading(False)
+        if len(page) < PAGE_SIZE:
+            self._exhausted = True
+        if page:
+            last_id, _, _, last_created_at = page[-1]
+            self._after = (last_created_at, last_id)
+
+        # Rows added this session may already be on screen once their sync finished
+        page = [tuple(expense) for expense in page if expense[0] not in self._position]
+        if self.criteria is None:
+            cache.add_page(self.user_id, page, self._after, self._exhausted)
+        if not page:
+            return
+
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        start = len(self._rows)
+        self._rows.extend(page)
+        self._reindex(self._rows, "paged", start)
+        self.endInsertRows()
+
+    def _on_page_failed(self, generation, error):
+        if generation != self._generation:
+            return
+        self._set_loading(False)
+        self._exhausted = True
+        self.load_failed.emit(error)
+
+    def _set_loading(self, loading):
+        self._loading = loading
+        self.loading_changed.emit(loading)
+
+    # **Row Lookup**
+    def _reindex(self, rows, kind, start):
+        """Refreshes the id -> position lookup for one list from a given index onwards."""
+        for i in range(start, len(rows)):
+            self._position[rows[i][0]] = (kind, i)
+
+    def expense_at(self, row):
+        """Returns the (id, expense_type, amount, created_at) tuple shown in a row."""
+        if row < len(self._added):
+            return self._added[len(self._added) - 1 - row]
+        return self._rows[row - len(self._added)]
+
+    def row_of(self, expense_id):
+        """Returns the row showing an expense id, or None."""
+        position = self._position.get(expense_id)
+        if position is None:
+            return None
+        kind, i = position
+        if kind == "added":
+            return len(self._added) - 1 - i
+        return len(self._added) + i
+
+    # **Incremental Updates**
+    def prepend_expense(self, expense_id, expense_type, amount, created_at):
+        """Shows a newly added expense at the top of the table."""
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._added.append((expense_id, expense_type, amount, created_at))
+        self._position[expense_id] = ("added", len(self._added) - 1)
+        self.endInsertRows()
+
+    def replace_id(self, old_id, new_id):
+        """Swaps a provisional id (an offline client_key) for the id the server assigned."""
+        position = self._position.pop(old_id, None)
+        if position is None:
+            return
+        kind, i = position
+        rows = self._added if kind == "added" else self._rows
+        rows[i] = (new_id,) + rows[i][1:]
+        self._position[new_id] = position
+        self.id_replaced.emit(old_id, new_id)
+
+    def update_expense(self, expense_id, expense_type, amount):
+        """Patches a single expense in place and repaints only its row."""
+        row = self.row_of(expense_id)
+        if row is None:
+            return
+        kind, i = self._position[expense_id]
+        rows = self._added if kind == "added" else self._rows
+        rows[i] = (expense_id, expense_type, amount, rows[i][3])
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+
+    def remove_expense(self, expense_id):
+        """Removes a single expense from the table."""
+        row = self.row_of(expense_id)
+        if row is None:
+            return
+        kind, i = self._position.pop(expense_id)
+        rows = self._added if kind == "added" else self._rows
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del rows[i]
+        self._reindex(rows, kind, i)
+        self.endRemoveRows()
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Paints Edit/Delete buttons in a cell instead of creating real widgets per row."""
+
+    edit_clicked = pyqtSignal(int)
+    delete_clicked = pyqtSignal(int)
+
+    LABELS = ("Edit", "Delete")
+    SPACING = 4
+
+    def _button_rects(self, rect):
+        width = (rect.width() - self.SPACING) // 2
+        edit_rect = QRect(rect.left(), rect.top(), width, rect.height())
+        delete_rect = QRect(rect.left() + width + self.SPACING, rect.top(), width, rect.height())
+        return edit_rect, delete_rect
+
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget else QApplication.style()
+        for label, rect in zip(self.LABELS, self._button_rects(option.rect)):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = label
+            button.state = QStyle.StateFlag.State_Enabled
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        """Turns a click inside a painted button into an edit/delete signal."""
+        if event.type() != QEvent.Type.MouseButtonRelease:
+            return False
+
+        edit_rect, delete_rect = self._button_rects(option.rect)
+        position = event.position().toPoint()
+        if edit_rect.contains(position):
+            self.edit_clicked.emit(index.row())
+            return True
+        if delete_rect.contains(position):
+            self.delete_clicked.emit(index.row())
+            return True
+        return False
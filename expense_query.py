@@ -0,0 +1,123 @@
+import re
+
+_TOKEN = re.compile(r"\w+")
+
+# Sort keys the builder accepts -> column; each has an index led by user_id
+SORT_COLUMNS = {
+    "created_at": "created_at",
+    "amount": "amount",
+    "expense_type": "expense_type"
+}
+
+
+def tokenize(text):
+    """Splits text into lowercase word tokens for type search."""
+    return _TOKEN.findall((text or "").lower())
+
+
+def matches_text(expense_type, text):
+    """True when every word of `text` starts some word of the expense type."""
+    tokens = tokenize(expense_type)
+    return all(any(token.startswith(query) for token in tokens) for query in tokenize(text))
+
+
+class ExpenseFilter:
+    """What the dashboard's filter bar asks for; empty fields match everything."""
+
+    def __init__(self, text="", types=None, min_amount=None, max_amount=None, date_from=None, date_to=None):
+        self.text = text.strip()
+        self.types = set(types) if types else None
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+        self.date_from = date_from  # datetime, inclusive
+        self.date_to = date_to      # datetime, exclusive
+
+    def is_empty(self):
+        return not self.text and self.types is None and self.min_amount is None \
+            and self.max_amount is None and self.date_from is None and self.date_to is None
+
+
+def _add_type_condition(where, params, criteria, known_types):
+    """Adds `expense_type IN (...)` for the criteria's types and text; False when no type can match."""
+    types = criteria.types
+    if criteria.text:
+        matching = {expense_type for expense_type in known_types if matches_text(expense_type, criteria.text)}
+        types = matching if types is None else types & matching
+    if types is not None:
+        if not types:
+            return False
+        where.append(f"expense_type IN ({', '.join(['%s'] * len(types))})")
+        params.extend(sorted(types))
+    return True
+
+
+def build_expense_query(user_id, criteria, known_types=(), order_by="created_at", descending=True,
+                        after=None, limit=200):
+    """Returns (sql, params) for one keyset page of a user's expenses matching `criteria`.
+
+    Free text is resolved against the user's known expense types first, so it
+    becomes `expense_type IN (...)` on the (user_id, expense_type, ...) index
+    instead of a LIKE '%...%' that scans every row. `after` is the (sort value, id)
+    of the last row already shown. Returns None when nothing can match.
+    """
+    column = SORT_COLUMNS[order_by]
+    where = ["user_id = %s"]
+    params = [user_id]
+    if not _add_type_condition(where, params, criteria, known_types):
+        return None
+
+    if criteria.min_amount is not None:
+        where.append("amount >= %s")
+        params.append(criteria.min_amount)
+    if criteria.max_amount is not None:
+        where.append("amount <= %s")
+        params.append(criteria.max_amount)
+    if criteria.date_from is not None:
+        where.append("created_at >= %s")
+        params.append(criteria.date_from)
+    if criteria.date_to is not None:
+        where.append("created_at < %s")
+        params.append(criteria.date_to)
+
+    comparison = "<" if descending else ">"
+    if after is not None:
+        value, expense_id = after
+        where.append(f"({column} {comparison} %s OR ({column} = %s AND id {comparison} %s))")
+        params.extend([value, value, expense_id])
+
+    direction = "DESC" if descending else "ASC"
+    sql = (
+        "SELECT id, expense_type, amount, created_at FROM expenses "
+        f"WHERE {' AND '.join(where)} "
+        f"ORDER BY {column} {direction}, id {direction} "
+        "LIMIT %s"
+    )
+    params.append(limit)
+    return sql, params
+
+
+def build_spending_query(user_id, criteria, known_types=()):
+    """Returns (sql, params) for a user's (day, total) spending series, oldest first.
+
+    The days are summed from expense_daily_rollup, so the database returns one
+    row per day however many expenses there are. The rollup has no per-expense
+    amounts, so amount bounds do not apply. Returns None when nothing can match.
+    """
+    where = ["user_id = %s"]
+    params = [user_id]
+    if not _add_type_condition(where, params, criteria, known_types):
+        return None
+    if criteria.date_from is not None:
+        where.append("day >= %s")
+        params.append(criteria.date_from.date())
+    if criteria.date_to is not None:
+        where.append("day < %s")
+        params.append(criteria.date_to.date())
+
+    sql = (
+        "SELECT day, SUM(total) FROM expense_daily_rollup "
+        f"WHERE {' AND '.join(where)} "
+        "GROUP BY day HAVING SUM(count) > 0 "
+        "ORDER BY day"
+    )
+    return sql, params
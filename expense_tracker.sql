@@ -32,7 +32,8 @@ CREATE TABLE `expenses` (
   `user_id` int(11) DEFAULT NULL,
   `expense_type` varchar(255) DEFAULT NULL,
   `amount` decimal(10,2) DEFAULT NULL,
-  `created_at` timestamp NOT NULL DEFAULT current_timestamp()
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  `client_key` char(32) DEFAULT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 --
@@ -48,6 +49,73 @@ INSERT INTO `expenses` (`id`, `user_id`, `expense_type`, `amount`, `created_at`)
 
 -- --------------------------------------------------------
 
+--
+-- Table structure for table `expense_daily_rollup`
+--
+-- Per-user, per-day, per-category totals kept in step with `expenses` by the
+-- application (same transaction as each insert, update and delete).
+--
+
+CREATE TABLE `expense_daily_rollup` (
+  `user_id` int(11) NOT NULL,
+  `day` date NOT NULL,
+  `expense_type` varchar(255) NOT NULL,
+  `total` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `count` int(11) NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+--
+-- Dumping data for table `expense_daily_rollup`
+--
+
+INSERT INTO `expense_daily_rollup` (`user_id`, `day`, `expense_type`, `total`, `count`) VALUES
+(6, '2025-05-09', 'Bills', 400.00, 1),
+(6, '2025-05-09', 'Entertainment', 500.00, 1),
+(6, '2025-05-09', 'Food', 500.00, 1),
+(10, '2025-05-09', 'Food', 500.00, 1),
+(10, '2025-05-09', 'Transportation', 500.00, 1);
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `budgets`
+--
+-- Per-user, per-category monthly limits. `spent` is a running counter for the
+-- month starting on `month`, kept in step by the same transactions that keep
+-- `expense_daily_rollup`; the first write in a later month restarts it from the
+-- rollup. Expenses dated after the current month are not counted until then.
+--
+
+CREATE TABLE `budgets` (
+  `user_id` int(11) NOT NULL,
+  `expense_type` varchar(255) NOT NULL,
+  `monthly_limit` decimal(10,2) NOT NULL,
+  `month` date NOT NULL,
+  `spent` decimal(14,2) NOT NULL DEFAULT 0.00
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `recurring_expenses`
+--
+-- Templates for expenses that repeat (rent, subscriptions). `next_run` is the
+-- next occurrence not yet written to `expenses`; the app inserts every due
+-- occurrence and advances it in one transaction.
+--
+
+CREATE TABLE `recurring_expenses` (
+  `id` int(11) NOT NULL,
+  `user_id` int(11) NOT NULL,
+  `expense_type` varchar(255) NOT NULL,
+  `amount` decimal(10,2) NOT NULL,
+  `frequency` varchar(10) NOT NULL,
+  `start_date` date NOT NULL,
+  `next_run` date NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
 --
 -- Table structure for table `users`
 --
@@ -56,7 +124,8 @@ CREATE TABLE `users` (
   `id` int(11) NOT NULL,
   `username` varchar(255) NOT NULL,
   `email` varchar(255) NOT NULL,
-  `password` varchar(255) NOT NULL
+  `password` varchar(255) NOT NULL,
+  `expense_version` int(11) NOT NULL DEFAULT 0
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 --
@@ -77,7 +146,29 @@ INSERT INTO `users` (`id`, `username`, `email`, `password`) VALUES
 --
 ALTER TABLE `expenses`
   ADD PRIMARY KEY (`id`),
-  ADD KEY `user_id` (`user_id`);
+  ADD UNIQUE KEY `client_key` (`client_key`),
+  ADD KEY `user_created_at` (`user_id`,`created_at`),
+  ADD KEY `user_type_created_at` (`user_id`,`expense_type`,`created_at`),
+  ADD KEY `user_amount` (`user_id`,`amount`);
+
+--
+-- Indexes for table `expense_daily_rollup`
+--
+ALTER TABLE `expense_daily_rollup`
+  ADD PRIMARY KEY (`user_id`,`day`,`expense_type`);
+
+--
+-- Indexes for table `budgets`
+--
+ALTER TABLE `budgets`
+  ADD PRIMARY KEY (`user_id`,`expense_type`);
+
+--
+-- Indexes for table `recurring_expenses`
+--
+ALTER TABLE `recurring_expenses`
+  ADD PRIMARY KEY (`id`),
+  ADD KEY `user_next_run` (`user_id`,`next_run`);
 
 --
 -- Indexes for table `users`
@@ -95,6 +186,12 @@ ALTER TABLE `users`
 ALTER TABLE `expenses`
   MODIFY `id` int(11) NOT NULL AUTO_INCREMENT, AUTO_INCREMENT=12;
 
+--
+-- AUTO_INCREMENT for table `recurring_expenses`
+--
+ALTER TABLE `recurring_expenses`
+  MODIFY `id` int(11) NOT NULL AUTO_INCREMENT;
+
 --
 -- AUTO_INCREMENT for table `users`
 --
@@ -110,8 +207,73 @@ ALTER TABLE `users`
 --
 ALTER TABLE `expenses`
   ADD CONSTRAINT `expenses_ibfk_1` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE;
+
+--
+-- Constraints for table `expense_daily_rollup`
+--
+ALTER TABLE `expense_daily_rollup`
+  ADD CONSTRAINT `expense_daily_rollup_ibfk_1` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE;
+
+--
+-- Constraints for table `budgets`
+--
+ALTER TABLE `budgets`
+  ADD CONSTRAINT `budgets_ibfk_1` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE;
+
+--
+-- Constraints for table `recurring_expenses`
+--
+ALTER TABLE `recurring_expenses`
+  ADD CONSTRAINT `recurring_expenses_ibfk_1` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE CASCADE;
 COMMIT;
 
+-- --------------------------------------------------------
+
+--
+-- Migrations for databases imported from an earlier dump
+--
+-- 001: replace the single-column `user_id` key with a composite
+--      (user_id, created_at) key; the foreign key still uses its prefix. Keep
+--      it to these two columns: its implicit `id` suffix is what serves the
+--      table's keyset paging (ORDER BY created_at DESC, id DESC) without a sort.
+--
+-- ALTER TABLE `expenses`
+--   ADD KEY `user_created_at` (`user_id`,`created_at`),
+--   DROP KEY `user_id`;
+--
+-- 002: create `expense_daily_rollup` as above, then backfill it once:
+--
+-- INSERT INTO `expense_daily_rollup` (`user_id`, `day`, `expense_type`, `total`, `count`)
+-- SELECT `user_id`, DATE(`created_at`), `expense_type`, SUM(`amount`), COUNT(*)
+-- FROM `expenses`
+-- WHERE `user_id` IS NOT NULL AND `expense_type` IS NOT NULL
+-- GROUP BY `user_id`, DATE(`created_at`), `expense_type`;
+--
+-- 003: idempotency key for expenses sent from the offline write queue.
+--
+-- ALTER TABLE `expenses`
+--   ADD `client_key` char(32) DEFAULT NULL,
+--   ADD UNIQUE KEY `client_key` (`client_key`);
+--
+-- 004: per-user counter bumped by every expense write, so the client-side
+--      expense cache can tell whether its copy is still current.
+--
+-- ALTER TABLE `users`
+--   ADD `expense_version` int(11) NOT NULL DEFAULT 0;
+--
+-- 005: keys for the dashboard's database-side filters (see check_query_plans.py):
+--      a type filter in date order, and an amount range on its own.
+--
+-- ALTER TABLE `expenses`
+--   ADD KEY `user_type_created_at` (`user_id`,`expense_type`,`created_at`),
+--   ADD KEY `user_amount` (`user_id`,`amount`);
+--
+-- 006: create `budgets` as above (with its primary key and foreign key).
+--      Counters start from the rollup when a budget is set, so no backfill.
+--
+-- 007: create `recurring_expenses` as above (with its keys, AUTO_INCREMENT and
+--      foreign key). `user_next_run` finds a user's due templates without a scan.
+
 /*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;
 /*!40101 SET CHARACTER_SET_RESULTS=@OLD_CHARACTER_SET_RESULTS */;
 /*!40101 SET COLLATION_CONNECTION=@OLD_COLLATION_CONNECTION */;
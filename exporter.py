@@ -0,0 +1,73 @@
+import csv
+import importlib.util
+import database
+
+CHUNK_SIZE = 5000
+COLUMNS = ["id", "expense_type", "amount", "created_at"]
+
+
+def parquet_available():
+    """Returns True when pyarrow is installed (without paying for importing it)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def export_expenses(path, user_id, progress=None):
+    """Writes a user's expenses to CSV, or Parquet for a .parquet path.
+
+    Runs on a worker thread. Rows are streamed in CHUNK_SIZE pieces, so memory
+    stays flat for any history size. `progress(percent)` returning False stops the
+    export early. Returns the number of rows written.
+    """
+    total = database.count_user_expenses(user_id) or 1
+    chunks = database.stream_user_expenses(user_id, CHUNK_SIZE)
+
+    if path.lower().endswith(".parquet"):
+        if not parquet_available():
+            raise RuntimeError("Parquet export needs the pyarrow package.")
+        return _write_parquet(path, chunks, total, progress)
+    return _write_csv(path, chunks, total, progress)
+
+
+def _report(progress, written, total):
+    return progress is None or progress(min(100, written * 100 // total))
+
+
+def _write_csv(path, chunks, total, progress):
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(COLUMNS)
+        for rows in chunks:
+            writer.writerows(
+                (expense_id, expense_type, f"{amount:.2f}", created_at.strftime("%Y-%m-%d %H:%M:%S"))
+                for expense_id, expense_type, amount, created_at in rows
+            )
+            written += len(rows)
+            if not _report(progress, written, total):
+                chunks.close()
+                break
+    return written
+
+
+def _write_parquet(path, chunks, total, progress):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("expense_type", pa.string()),
+        ("amount", pa.decimal128(10, 2)),
+        ("created_at", pa.timestamp("s"))
+    ])
+    written = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            columns[2] = [amount.to_decimal() for amount in columns[2]]  # pyarrow takes Decimal, not Money
+            arrays = [pa.array(column, field.type) for column, field in zip(columns, schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            written += len(rows)
+            if not _report(progress, written, total):
+                chunks.close()
+                break
+    return written
@@ -4,7 +4,8 @@ from PyQt6.QtWidgets import (
     QHBoxLayout, QFrame, QTextEdit
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap, QPalette, QBrush
+from image_cache import install_background
+from theme import style
 import webbrowser
 
 class GuidePage(QWidget):
@@ -15,27 +16,19 @@ class GuidePage(QWidget):
         self.resize(500, 400)
 
         # **Set Background Image**
-        palette = QPalette()
-        bg_image = QPixmap("guide.jpg")
-        palette.setBrush(QPalette.ColorRole.Window, QBrush(bg_image))
-        self.setPalette(palette)
+        install_background(self, "guide.jpg")
 
         main_layout = QVBoxLayout(self)
         self.setLayout(main_layout)
 
         # **Navbar**
         navbar_layout = QHBoxLayout()
-        button_style = (
-            "padding: 8px; font-size: 16px; border-radius: 5px; "
-            "background-color: white; color: black;"
-        )
-
         self.home_button = QPushButton("Home")
-        self.home_button.setStyleSheet(button_style)
+        style(self.home_button, "nav")
         self.register_button = QPushButton("Register")
-        self.register_button.setStyleSheet(button_style)
+        style(self.register_button, "nav")
         self.login_button = QPushButton("Login")
-        self.login_button.setStyleSheet(button_style)
+        style(self.login_button, "nav")
 
         self.home_button.clicked.connect(lambda: self.switch_page("LandingPage"))
         self.register_button.clicked.connect(lambda: self.switch_page("RegistrationWindow"))
@@ -48,25 +41,19 @@ class GuidePage(QWidget):
 
         # **Content Box for Financial Knowledge**
         content_container = QFrame()
-        content_container.setStyleSheet(
-            "border: 2px solid white; padding: 20px; border-radius: 10px; "
-            "background-color: rgba(255, 255, 255, 0.95);"
-        )
+        style(content_container, "card")
         content_layout = QVBoxLayout(content_container)
 
         # **Header**
         self.page_header = QLabel("Guide & Knowledge - Saving Money")
-        self.page_header.setStyleSheet("font-size: 24px; font-weight: bold; color: black;")
+        style(self.page_header, "sectionTitle")
         self.page_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(self.page_header)
 
         # **Guide Text Section**
         self.guide_text = QTextEdit()
         self.guide_text.setReadOnly(True)
-        self.guide_text.setStyleSheet(
-            "font-size: 14px; color: black; font-weight: bold; border: none; "
-            "background-color: transparent;"
-        )
+        style(self.guide_text, "article")
         self.guide_text.setText(
             "Want to save more money? Here are some essential tips:\n\n"
             "1️⃣ **Track Your Spending** – Analyze where your money goes each month.\n"
@@ -83,7 +70,7 @@ class GuidePage(QWidget):
 
         # **Helpful Financial Links**
         self.resources_label = QLabel("Helpful Money-Saving Resources:")
-        self.resources_label.setStyleSheet("font-size: 16px; font-weight: bold; color: black;")
+        style(self.resources_label, "subheading")
         content_layout.addWidget(self.resources_label, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.create_link_button("Investopedia - Saving Basics", "https://www.investopedia.com/articles/personal-finance/041515/top-money-saving-tips.asp", content_layout)
@@ -97,52 +84,20 @@ class GuidePage(QWidget):
     def create_link_button(self, text, url, layout):
         """Creates a clickable button that opens a financial website in a browser."""
         button = QPushButton(text)
-        button.setStyleSheet("""
-            QPushButton {
-                padding: 8px;
-                font-size: 14px;
-                border-radius: 4px;
-                background-color: #007BFF;
-                color: white;
-                width: 250px;
-            }
-            QPushButton:hover {
-                background-color: #0056b3;
-            }
-        """)
+        style(button, "link", "blue")
         button.clicked.connect(lambda: webbrowser.open(url))
         layout.addWidget(button, alignment=Qt.AlignmentFlag.AlignCenter)
 
     def switch_page(self, page_name):
-        """Handles switching pages while maintaining window size."""
-        current_size = self.size()
-        self.close()
-
-        new_page = None
-        if page_name == "LoginWindow":
-            from login import LoginWindow
-            new_page = LoginWindow()
-        elif page_name == "LandingPage":
-            from landing import LandingPage
-            new_page = LandingPage()
-        elif page_name == "RegistrationWindow":
-            from register import RegistrationWindow
-            new_page = RegistrationWindow()
-        elif page_name == "AboutPage":
-            from about import AboutPage
-            new_page = AboutPage()
-
-        if new_page:
-            new_page.resize(current_size)
-            new_page.show()
+        """Shows another page in the shared window, reusing it if it was built before."""
+        from navigator import get_navigator
+        get_navigator().navigate(page_name)
 
 if __name__ == "__main__":
-    from register import RegistrationWindow
-    from login import LoginWindow
-    from landing import LandingPage
-    from about import AboutPage
+    from navigator import get_navigator
 
     app = QApplication(sys.argv)
-    window = GuidePage()
+    window = get_navigator()
+    window.navigate("GuidePage")
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QEvent, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPalette, QBrush, QPixmap
+from workers import TaskRunner
+
+IMAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+MAX_SCALED_VARIANTS = 8
+PREVIEW_DIVISOR = 8  # JPEG can decode at 1/8 size far faster than at full size
+
+_cache = None
+
+
+def _decode(path, scaled_size=None):
+    """Decodes an image file to a QImage (safe off the GUI thread, unlike QPixmap)."""
+    reader = QImageReader(path)
+    if scaled_size is not None:
+        reader.setScaledSize(scaled_size)
+    return reader.read()
+
+
+class ImageCache(QObject):
+    """Decodes each background once and keeps window-sized copies in an LRU cache.
+
+    The first request for an image gets a quick low-resolution preview while the
+    full decode runs on the thread pool; image_ready fires when it is done so
+    pages can repaint with the sharp version.
+    """
+
+    image_ready = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.tasks = TaskRunner(self)
+        self._full = {}
+        self._previews = {}
+        self._scaled = OrderedDict()
+
+    def _source(self, filename):
+        """Returns the best decoded image available now, starting the full decode if needed."""
+        if filename in self._full:
+            return self._full[filename]
+
+        if filename not in self._previews:
+            path = os.path.join(IMAGE_DIR, filename)
+            size = QImageReader(path).size()
+            preview = QImage()
+            if size.isValid():
+                preview_size = QSize(max(1, size.width() // PREVIEW_DIVISOR), max(1, size.height() // PREVIEW_DIVISOR))
+                preview = _decode(path, preview_size)
+            self._previews[filename] = preview
+            self.tasks.run(_decode, path, on_success=lambda image: self._on_decoded(filename, image))
+        return self._previews[filename]
+
+    def _on_decoded(self, filename, image):
+        self._full[filename] = image
+        self._previews.pop(filename, None)
+        for key in [key for key in self._scaled if key[0] == filename]:
+            del self._scaled[key]  # Drop variants scaled from the preview
+        self.image_ready.emit(filename)
+
+    def scaled(self, filename, size):
+        """Returns a pixmap of the image covering `size`, or a null pixmap if it is missing."""
+        key = (filename, size.width(), size.height())
+        pixmap = self._scaled.get(key)
+        if pixmap is not None:
+            self._scaled.move_to_end(key)
+            return pixmap
+
+        image = self._source(filename)
+        if image.isNull():
+            return QPixmap()
+        pixmap = QPixmap.fromImage(image.scaled(
+            size, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation
+        ))
+        self._scaled[key] = pixmap
+        while len(self._scaled) > MAX_SCALED_VARIANTS:
+            self._scaled.popitem(last=False)
+        return pixmap
+
+
+def get_image_cache():
+    """Returns the app-wide image cache."""
+    global _cache
+    if _cache is None:
+        _cache = ImageCache()
+    return _cache
+
+
+class _BackgroundPainter(QObject):
+    """Re-applies a page's cached background when the page resizes or the image finishes decoding."""
+
+    def __init__(self, widget, filename):
+        super().__init__(widget)
+        self.widget = widget
+        self.filename = filename
+        widget.installEventFilter(self)
+        get_image_cache().image_ready.connect(self._on_image_ready)
+        self.apply()
+
+    def apply(self):
+        pixmap = get_image_cache().scaled(self.filename, self.widget.size())
+        if pixmap.isNull():
+            return
+        palette = self.widget.palette()
+        palette.setBrush(QPalette.ColorRole.Window, QBrush(pixmap))
+        self.widget.setPalette(palette)
+
+    def _on_image_ready(self, filename):
+        if filename == self.filename:
+            self.apply()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Resize:
+            self.apply()
+        return False
+
+
+def install_background(widget, filename):
+    """Gives a page a window-sized background from the shared cache."""
+    return _BackgroundPainter(widget, filename)
@@ -0,0 +1,163 @@
+import csv
+import os
+from datetime import datetime
+import database
+from money import Money
+
+CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 20
+
+# **Accepted Column Names** - our own export plus common bank-statement headers
+TYPE_COLUMNS = ("expense_type", "type", "category", "description", "details")
+AMOUNT_COLUMNS = ("amount", "debit", "withdrawal", "amount (₱)")
+DEBIT_COLUMNS = ("debit", "withdrawal")  # Money going out only; credits sit in another column
+DATE_COLUMNS = ("created_at", "date", "transaction date", "posting date", "posted date")
+DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%b %d, %Y")
+
+
+class ImportResult:
+    """Counts of what an import did, plus the first few rejected lines."""
+
+    def __init__(self):
+        self.imported = 0
+        self.skipped = 0
+        self.credits = 0  # Rows of money coming in, which are not expenses
+        self.errors = []
+        self.cancelled = False
+
+    def reject(self, line_number, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Line {line_number}: {message}")
+
+
+def import_csv(path, user_id, progress=None, chunk_size=CHUNK_SIZE):
+    """Streams a CSV file into the user's expenses, one transaction per chunk.
+
+    Only one chunk is held in memory at a time. Runs on a worker thread;
+    `progress(percent)` is called after each chunk and stops the import
+    (keeping the chunks already committed) when it returns False.
+
+    Amounts follow one sign convention per file. A debit/withdrawal column holds
+    only money going out. In an amount column, a file with any negative amount
+    is a signed statement: negative rows are expenses and positive ones credits,
+    which are counted but not imported. Otherwise every amount is an expense.
+    """
+    result = ImportResult()
+    file_size = os.path.getsize(path) or 1
+
+    with open(path, "rb") as raw_file:
+        bytes_read = 0
+
+        def lines():
+            nonlocal bytes_read
+            for raw_line in raw_file:
+                bytes_read += len(raw_line)
+                yield raw_line.decode("utf-8-sig" if bytes_read == len(raw_line) else "utf-8")
+
+        reader = csv.reader(lines())
+        header = next(reader, None)
+        if not header:
+            return result
+        columns = _match_columns(header)
+        if not columns["debit"]:
+            columns["signed"] = _has_negative_amounts(path, columns["amount"])
+
+        chunk = []
+        for record in reader:
+            line_number = reader.line_num
+            if not any(cell.strip() for cell in record):
+                continue
+            try:
+                expense = _parse_record(record, columns)
+            except ValueError as e:
+                result.reject(line_number, str(e))
+                continue
+            if expense is None:
+                result.credits += 1
+                continue
+            chunk.append(expense)
+
+            if len(chunk) >= chunk_size:
+                database.insert_expenses_batch(user_id, chunk)
+                result.imported += len(chunk)
+                chunk = []
+                if progress and not progress(min(99, bytes_read * 100 // file_size)):
+                    result.cancelled = True
+                    return result
+
+        if chunk:
+            database.insert_expenses_batch(user_id, chunk)
+            result.imported += len(chunk)
+
+    if progress:
+        progress(100)
+    return result
+
+
+def _match_columns(header):
+    """Maps a header row to the positions of the type, amount and date columns."""
+    names = [name.strip().lower() for name in header]
+
+    def find(candidates, required):
+        for candidate in candidates:
+            if candidate in names:
+                return names.index(candidate)
+        if required:
+            raise ValueError(f"CSV needs one of these columns: {', '.join(candidates)}")
+        return None
+
+    amount = find(AMOUNT_COLUMNS, True)
+    return {
+        "type": find(TYPE_COLUMNS, True),
+        "amount": amount,
+        "date": find(DATE_COLUMNS, False),
+        "debit": names[amount] in DEBIT_COLUMNS,
+        "signed": False
+    }
+
+
+def _has_negative_amounts(path, position):
+    """Reads just the amount column ahead of the import to tell a signed statement from a plain list."""
+    with open(path, encoding="utf-8-sig", newline="") as csv_file:
+        reader = csv.reader(csv_file)
+        next(reader, None)
+        return any(position < len(record) and record[position].strip().startswith("-") for record in reader)
+
+
+def _parse_record(record, columns):
+    """Validates one CSV row and returns (expense_type, amount, created_at), or None for a credit."""
+    def cell(key):
+        position = columns[key]
+        if position is None or position >= len(record):
+            return ""
+        return record[position].strip()
+
+    amount_text = cell("amount")
+    if columns["debit"]:
+        if not amount_text:
+            return None  # The row's money came in, in the credit column
+        amount = abs(Money.parse(amount_text)).check_expense()  # Some banks sign their debits
+    elif columns["signed"]:
+        amount = Money.parse(amount_text)
+        if amount.cents > 0:
+            return None
+        amount = (-amount).check_expense()
+    else:
+        amount = Money.parse_expense(amount_text)
+
+    expense_type = cell("type")
+    if not expense_type:
+        raise ValueError("missing expense type")
+    if len(expense_type) > database.MAX_EXPENSE_TYPE_LENGTH:
+        raise ValueError(f"expense type is longer than {database.MAX_EXPENSE_TYPE_LENGTH} characters")
+
+    date_text = cell("date")
+    if not date_text:
+        return expense_type, amount, datetime.now().replace(microsecond=0)
+    for date_format in DATE_FORMATS:
+        try:
+            return expense_type, amount, datetime.strptime(date_text, date_format)
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognised date '{date_text}'")
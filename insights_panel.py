@@ -0,0 +1,188 @@
+import calendar
+import importlib.util
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import (
+    QGroupBox, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from expense_cache import get_expense_cache
+from theme import style
+
+SHOWN_MONTHS = 12
+OUTLIER_REFRESH_MS = 10000  # Quiet time after the last write before unusual expenses are re-scanned
+
+
+def numpy_available():
+    """Returns True when NumPy is installed (without paying for importing it)."""
+    return importlib.util.find_spec("numpy") is not None
+
+
+def _analyze(summary):
+    import analytics  # Loads NumPy on first use instead of at startup
+    return analytics.analyze_summary(summary)
+
+
+def _find_outliers(user_id, rows):
+    import analytics
+    return analytics.user_outliers(user_id, rows)
+
+
+class InsightsPanel(QGroupBox):
+    """Shows spending trends, this month's forecast and unusual expenses over the full history."""
+
+    def __init__(self, tasks, parent=None):
+        super().__init__("Insights", parent)
+        self.tasks = tasks
+        self.user_id = None
+        self.scan_task = None
+        self.scanned = False  # Whether the table shows a scan of this user at all
+        self.outlier_timer = QTimer(self)
+        self.outlier_timer.setSingleShot(True)
+        self.outlier_timer.timeout.connect(self.scan_outliers)
+        style(self, "panel")
+
+        layout = QVBoxLayout(self)
+
+        self.forecast_label = QLabel("Forecast: –")
+        style(self.forecast_label, "total")
+        layout.addWidget(self.forecast_label)
+
+        self.average_label = QLabel("")
+        layout.addWidget(self.average_label)
+
+        self.trend_table = self._make_table(["Month", "Spent (₱)", "3-mo avg (₱)"])
+        layout.addWidget(QLabel("Monthly Trend"))
+        layout.addWidget(self.trend_table)
+
+        self.share_table = self._make_table(["Category", "Share"])
+        layout.addWidget(QLabel("Category Shares"))
+        layout.addWidget(self.share_table)
+
+        self.outlier_table = self._make_table(["Date", "Category", "Amount (₱)"])
+        layout.addWidget(QLabel("Unusual Expenses"))
+        layout.addWidget(self.outlier_table)
+
+        if not numpy_available():
+            self.forecast_label.setText("Install numpy to see spending insights.")
+            for table in (self.trend_table, self.share_table, self.outlier_table):
+                table.hide()
+
+    def _make_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        return table
+
+    def refresh(self, user_id):
+        """Switches to a user and keeps their unusual expenses current.
+
+        Trends, shares and the forecast follow SummaryPanel instead (see
+        show_summary_insights). Unusual expenses need every row; the last scan
+        stays on screen and a new one runs once writes pause for OUTLIER_REFRESH_MS.
+        """
+        if not numpy_available():
+            return
+        if user_id != self.user_id:
+            self.user_id = user_id
+            self.outlier_timer.stop()
+            self.scanned = False
+            self.show_outliers([])
+
+        entry = get_expense_cache().get(user_id)
+        if entry is not None and entry.outliers is not None:
+            version, outliers = entry.outliers
+            self.show_outliers(outliers)
+            if version != entry.version:
+                self.outlier_timer.start(OUTLIER_REFRESH_MS)
+        elif self.scanned:
+            self.outlier_timer.start(OUTLIER_REFRESH_MS)
+        elif not self.is_scanning():
+            self.outlier_timer.start(0)  # Nothing to show yet, so scan right away
+
+    def show_summary_insights(self, user_id, version, summary):
+        """Derives trends, shares and the forecast from the summary SummaryPanel just showed.
+
+        Connected to SummaryPanel.summary_loaded, so the rollup is read once for both panels.
+        """
+        if not numpy_available():
+            return
+        entry = get_expense_cache().get(user_id)
+        if entry is not None and entry.version == version and entry.insights is not None:
+            self.show_insights(entry.insights)
+            return
+        self.tasks.run(
+            _analyze, summary,
+            on_success=lambda insights: self._on_insights_loaded(user_id, version, insights)
+        )
+
+    def _on_insights_loaded(self, user_id, version, insights):
+        entry = get_expense_cache().get(user_id)
+        if entry is not None and entry.version == version:
+            entry.insights = insights  # Only if no write landed while the analysis ran
+        if user_id == self.user_id:
+            self.show_insights(insights)
+
+    def is_scanning(self):
+        """Returns True while a scan is running (one cancelled with the page doesn't count)."""
+        return self.scan_task is not None and not self.scan_task.cancelled
+
+    def scan_outliers(self):
+        """Looks for unusual expenses on a worker thread, reusing a fully loaded history from the cache."""
+        if self.is_scanning():
+            self.outlier_timer.start(OUTLIER_REFRESH_MS)  # Try again once the running scan is done
+            return
+        user_id = self.user_id
+        entry = get_expense_cache().get(user_id)
+        version = entry.version if entry is not None else None
+        rows = list(entry.rows) if entry is not None and entry.exhausted else None
+        self.scan_task = self.tasks.run(
+            _find_outliers, user_id, rows,
+            on_success=lambda outliers: self._on_outliers_found(user_id, version, outliers),
+            on_error=lambda _: setattr(self, "scan_task", None)
+        )
+
+    def _on_outliers_found(self, user_id, version, outliers):
+        self.scan_task = None
+        entry = get_expense_cache().get(user_id)
+        if entry is not None and version is not None:
+            entry.outliers = (version, outliers)
+        if user_id != self.user_id:
+            self.outlier_timer.start(0)  # The user changed while this scan ran
+            return
+        self.scanned = True
+        self.show_outliers(outliers)
+        if entry is not None and entry.version != version:
+            self.outlier_timer.start(OUTLIER_REFRESH_MS)  # Writes landed during the scan
+
+    def show_insights(self, insights):
+        """Fills the trend, share and forecast parts from an analytics.analyze_summary() result."""
+        forecast = insights["forecast"]
+        if forecast is None:
+            self.forecast_label.setText("Forecast: –")
+            self.average_label.setText("")
+        else:
+            year, month, estimate, spent = forecast
+            self.forecast_label.setText(f"{calendar.month_abbr[month]} forecast: ₱{estimate:,.2f}")
+            self.average_label.setText(f"Spent so far: ₱{spent:,.2f}")
+
+        months = insights["months"][:SHOWN_MONTHS]
+        self.trend_table.setRowCount(len(months))
+        for row, (year, month, total, rolling) in enumerate(months):
+            self.trend_table.setItem(row, 0, QTableWidgetItem(f"{calendar.month_abbr[month]} {year}"))
+            self.trend_table.setItem(row, 1, QTableWidgetItem(f"{total:,.2f}"))
+            self.trend_table.setItem(row, 2, QTableWidgetItem(f"{rolling:,.2f}"))
+
+        shares = insights["shares"]
+        self.share_table.setRowCount(len(shares))
+        for row, (expense_type, share, _) in enumerate(shares):
+            self.share_table.setItem(row, 0, QTableWidgetItem(expense_type))
+            self.share_table.setItem(row, 1, QTableWidgetItem(f"{share:.1%}"))
+
+    def show_outliers(self, outliers):
+        """Fills the unusual expenses table from an analytics.find_outliers() result."""
+        self.outlier_table.setRowCount(len(outliers))
+        for row, (_, expense_type, amount, created_at, _) in enumerate(outliers):
+            self.outlier_table.setItem(row, 0, QTableWidgetItem(created_at.strftime("%Y-%m-%d")))
+            self.outlier_table.setItem(row, 1, QTableWidgetItem(expense_type))
+            self.outlier_table.setItem(row, 2, QTableWidgetItem(f"{amount:,.2f}"))
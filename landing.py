@@ -4,7 +4,8 @@ from PyQt6.QtWidgets import (
     QHBoxLayout, QFrame
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap, QPalette, QBrush
+from image_cache import install_background
+from theme import style
 
 class LandingPage(QWidget):
     def __init__(self):
@@ -14,27 +15,19 @@ class LandingPage(QWidget):
         self.resize(500, 400)
 
         # **Set Background Image**
-        palette = QPalette()
-        bg_image = QPixmap("bg.jpg") 
-        palette.setBrush(QPalette.ColorRole.Window, QBrush(bg_image))
-        self.setPalette(palette)
+        install_background(self, "bg.jpg")
 
         main_layout = QVBoxLayout(self)
         self.setLayout(main_layout)
 
         # **Navbar Positioned at the Top**
         navbar_layout = QHBoxLayout()
-        button_style = (
-            "padding: 8px; font-size: 16px; border-radius: 5px; "
-            "background-color: white; color: black;"
-        )
-
         self.home_button = QPushButton("Home")
-        self.home_button.setStyleSheet(button_style)
+        style(self.home_button, "nav")
         self.register_button = QPushButton("Register")
-        self.register_button.setStyleSheet(button_style)
+        style(self.register_button, "nav")
         self.login_button = QPushButton("Login")
-        self.login_button.setStyleSheet(button_style)
+        style(self.login_button, "nav")
 
         self.home_button.clicked.connect(lambda: self.switch_page("LandingPage"))
         self.register_button.clicked.connect(lambda: self.switch_page("RegistrationWindow"))
@@ -47,15 +40,12 @@ class LandingPage(QWidget):
 
         # **Boxed Container for Header, Description & Buttons**
         content_container = QFrame()
-        content_container.setStyleSheet(
-            "border: 2px solid white; padding: 20px; border-radius: 10px; "
-            "background-color: rgba(255, 255, 255, 0.95);"
-        )
+        style(content_container, "card")
         content_layout = QVBoxLayout(content_container)
 
         # **Header Inside Boxed Section**
         self.page_header = QLabel("Personal Expense Tracker")
-        self.page_header.setStyleSheet("font-size: 30px; font-weight: bold; color: black;")
+        style(self.page_header, "pageTitle")
         self.page_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(self.page_header)
 
@@ -66,54 +56,25 @@ class LandingPage(QWidget):
             "and analyze your expenses with ease.\n"
             "Sign up now to take control of your finances!"
         )
-        self.system_description_label.setStyleSheet("font-size: 14px; color: black; font-weight: bold")
+        style(self.system_description_label, "description")
         self.system_description_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(self.system_description_label)
 
         # **Get Started Button**
         self.get_started_button = QPushButton("Get Started")
-        self.get_started_button.setStyleSheet(
-            "padding: 12px; font-size: 18px; font-weight: bold; "
-            "border-radius: 5px; background-color: #007BFF; color: white; width: 200px;"
-        )
+        style(self.get_started_button, "primary", "blue")
         self.get_started_button.clicked.connect(lambda: self.switch_page("RegistrationWindow"))
         content_layout.addWidget(self.get_started_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
         # **About Us Button**
         self.about_button = QPushButton("About Us")
-        self.about_button.setStyleSheet("""
-            QPushButton {
-                padding: 10px;
-                font-size: 16px;
-                font-weight: bold;
-                border-radius: 5px;
-                background-color: #007BFF;
-                color: white;
-                width: 180px;
-            }
-            QPushButton:hover {
-                background-color: #0056b3;
-            }
-        """)
+        style(self.about_button, "action", "blue")
         self.about_button.clicked.connect(lambda: self.switch_page("AboutPage"))
         content_layout.addWidget(self.about_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
         # **Guide and Knowledge Button**
         self.guide_button = QPushButton("Guide and Knowledge")
-        self.guide_button.setStyleSheet("""
-            QPushButton {
-                padding: 10px;
-                font-size: 16px;
-                font-weight: bold;
-                border-radius: 5px;
-                background-color: #28A745;
-                color: white;
-                width: 180px;
-            }
-            QPushButton:hover {
-                background-color: #218838;
-            }
-        """)
+        style(self.guide_button, "action", "green")
         self.guide_button.clicked.connect(lambda: self.switch_page("GuidePage"))
         content_layout.addWidget(self.guide_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
@@ -122,37 +83,15 @@ class LandingPage(QWidget):
         main_layout.addStretch()
 
     def switch_page(self, page_name):
-        """Handles switching pages while maintaining window size."""
-        current_size = self.size()
-        self.close()
-
-        new_page = None
-        if page_name == "LoginWindow":
-            from login import LoginWindow
-            new_page = LoginWindow()
-        elif page_name == "LandingPage":
-            new_page = LandingPage()
-        elif page_name == "RegistrationWindow":
-            from register import RegistrationWindow
-            new_page = RegistrationWindow()
-        elif page_name == "AboutPage":
-            from about import AboutPage  
-            new_page = AboutPage()
-        elif page_name == "GuidePage":
-            from guide import GuidePage
-            new_page = GuidePage()
-
-        if new_page:
-            new_page.resize(current_size)
-            new_page.show()
+        """Shows another page in the shared window, reusing it if it was built before."""
+        from navigator import get_navigator
+        get_navigator().navigate(page_name)
 
 if __name__ == "__main__":
-    from register import RegistrationWindow
-    from login import LoginWindow
-    from about import AboutPage
-    from guide import GuidePage
+    from navigator import get_navigator
 
     app = QApplication(sys.argv)
-    window = LandingPage()
+    window = get_navigator()
+    window.navigate("LandingPage")
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
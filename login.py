@@ -1,25 +1,13 @@
 import sys
-import mysql.connector
-import bcrypt
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout,
     QHBoxLayout, QLineEdit, QFrame, QMessageBox
 )
 from PyQt6.QtCore import Qt, QSettings
-from PyQt6.QtGui import QPixmap, QPalette, QBrush
-
-# **Database Connection**
-try:
-    db = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",
-        database="expense_tracker"
-    )
-    cursor = db.cursor()
-except mysql.connector.Error as e:
-    print(f"Database connection failed: {e}")
-    db = None
+from image_cache import install_background
+from theme import style
+import auth
+from workers import TaskRunner
 
 class LoginWindow(QWidget):
     def __init__(self):
@@ -27,26 +15,22 @@ class LoginWindow(QWidget):
 
         self.setWindowTitle("Personal Expense Tracker Login")
         self.resize(500, 400)
+        self.tasks = TaskRunner(self)
 
         # **Background Image**
-        palette = QPalette()
-        bg_image = QPixmap("bg2.jpg")
-        palette.setBrush(QPalette.ColorRole.Window, QBrush(bg_image))
-        self.setPalette(palette)
+        install_background(self, "bg2.jpg")
 
         main_layout = QVBoxLayout(self)
         self.setLayout(main_layout)
 
         # **Navbar**
         navbar_layout = QHBoxLayout()
-        button_style = "padding: 8px; font-size: 16px; border-radius: 5px; background-color: white; color: black;"
-
         self.home_button = QPushButton("Home")
-        self.home_button.setStyleSheet(button_style)
+        style(self.home_button, "nav")
         self.register_nav_button = QPushButton("Register")
-        self.register_nav_button.setStyleSheet(button_style)
+        style(self.register_nav_button, "nav")
         self.login_nav_button = QPushButton("Login")
-        self.login_nav_button.setStyleSheet(button_style)
+        style(self.login_nav_button, "nav")
 
         self.home_button.clicked.connect(lambda: self.switch_page("LandingPage"))
         self.register_nav_button.clicked.connect(lambda: self.switch_page("RegistrationWindow"))
@@ -59,15 +43,12 @@ class LoginWindow(QWidget):
 
         # **Content Container**
         content_container = QFrame()
-        content_container.setStyleSheet(
-            "border: 2px solid white; padding: 20px; border-radius: 10px; "
-            "background-color: rgba(255, 255, 255, 0.95);"
-        )
+        style(content_container, "card")
         content_layout = QVBoxLayout(content_container)
 
         # **Header**
         self.page_header = QLabel("Personal Expense Tracker Login")
-        self.page_header.setStyleSheet("font-size: 30px; font-weight: bold; color: black;")
+        style(self.page_header, "pageTitle")
         self.page_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(self.page_header)
 
@@ -77,30 +58,25 @@ class LoginWindow(QWidget):
             "Securely view, manage, and analyze your financial records.\n"
             "Sign in now to continue your financial journey!"
         )
-        self.system_description_label.setStyleSheet("font-size: 14px; color: black; font-weight: bold")
+        style(self.system_description_label, "description")
         self.system_description_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(self.system_description_label)
 
         # **Login Form**
-        input_style = "padding: 6px; font-size: 14px; border-radius: 5px; background-color: white; color: black; width: 250px;"
-
         self.username_input = QLineEdit()
         self.username_input.setPlaceholderText("Enter Username")
-        self.username_input.setStyleSheet(input_style)
+        style(self.username_input, "input")
         content_layout.addWidget(self.username_input, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.password_input = QLineEdit()
         self.password_input.setPlaceholderText("Enter Password")
         self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
-        self.password_input.setStyleSheet(input_style)
+        style(self.password_input, "input")
         content_layout.addWidget(self.password_input, alignment=Qt.AlignmentFlag.AlignCenter)
 
         # **Login Button**
         self.login_button = QPushButton("Login")
-        self.login_button.setStyleSheet(
-            "padding: 12px; font-size: 18px; font-weight: bold; border-radius: 5px; "
-            "background-color: #007BFF; color: white; width: 200px;"
-        )
+        style(self.login_button, "primary", "blue")
         self.login_button.clicked.connect(self.validate_form)
         content_layout.addWidget(self.login_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
@@ -110,10 +86,6 @@ class LoginWindow(QWidget):
 
     def validate_form(self):
         """Verifies login credentials, stores user session, and redirects to dashboard."""
-        if not db:
-            QMessageBox.critical(self, "Database Error", "Database connection failed!")
-            return
-
         username = self.username_input.text().strip()
         password = self.password_input.text().strip()
 
@@ -121,53 +93,67 @@ class LoginWindow(QWidget):
             QMessageBox.warning(self, "Validation Error", "All fields must be filled!")
             return
 
-        try:
-            cursor.execute("SELECT id, password FROM users WHERE username = %s", (username,))
-            user = cursor.fetchone()
+        self.set_loading(True)
+        self.tasks.run(
+            auth.authenticate, username, password,
+            on_success=self.on_authenticated,
+            on_error=self.show_database_error
+        )
+
+    def on_authenticated(self, user_id):
+        """Opens the dashboard once the background password check succeeds."""
+        self.set_loading(False)
+
+        if user_id:
+            QMessageBox.information(self, "Success", "Login successful!")
+
+            # ✅ Store user ID in settings for session tracking
+            settings = QSettings("MyApp", "ExpenseTracker")
+            settings.setValue("user_id", user_id)
+
+            self.redirect_to_dashboard()
+        else:
+            QMessageBox.warning(self, "Login Failed", "Invalid username or password!")
 
-            if user and bcrypt.checkpw(password.encode(), user[1].encode()):
-                QMessageBox.information(self, "Success", "Login successful!")
+    def show_database_error(self, error):
+        """Reports a failed background query."""
+        self.set_loading(False)
+        QMessageBox.critical(self, "Database Error", f"Error: {error}")
 
-                # ✅ Store user ID in settings for session tracking
-                settings = QSettings("MyApp", "ExpenseTracker")
-                settings.setValue("user_id", user[0])
+    def set_loading(self, loading):
+        """Disables the form while a login request is in flight."""
+        self.login_button.setEnabled(not loading)
+        self.login_button.setText("Logging in..." if loading else "Login")
 
-                self.redirect_to_dashboard()
-            else:
-                QMessageBox.warning(self, "Login Failed", "Invalid username or password!")
-        except mysql.connector.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Error: {e}")
+    def closeEvent(self, event):
+        """Cancels a pending login check when the window closes."""
+        self.tasks.cancel_all()
+        super().closeEvent(event)
+
+    def on_leave(self):
+        """Drops a pending login check when the user navigates away."""
+        self.tasks.cancel_all()
+        self.set_loading(False)
+
+    def reset_state(self):
+        """Clears the form when the cached page is shown again."""
+        for field in (self.username_input, self.password_input):
+            field.clear()
 
     def redirect_to_dashboard(self):
-        """Closes login window and opens the Dashboard."""
-        from dashboard import Dashboard
-        self.dashboard = Dashboard()
-        self.dashboard.resize(self.size())  # ✅ Maintains window size consistency
-        self.dashboard.show()
-        self.close()  # ✅ Ensures login window closes properly
+        """Swaps the login page for the Dashboard in the same window."""
+        self.switch_page("Dashboard")
 
     def switch_page(self, page_name):
-        """Closes current window and opens a new one while maintaining window size."""
-        current_size = self.size()
-        self.close()
-
-        if page_name == "RegistrationWindow":
-            from register import RegistrationWindow
-            new_page = RegistrationWindow()
-        elif page_name == "LandingPage":
-            from landing import LandingPage
-            new_page = LandingPage()
-        elif page_name == "Dashboard":
-            from dashboard import Dashboard
-            new_page = Dashboard()
-        elif page_name == "LoginWindow":
-            new_page = LoginWindow()
-
-        new_page.resize(current_size)
-        new_page.show()
+        """Shows another page in the shared window, reusing it if it was built before."""
+        from navigator import get_navigator
+        get_navigator().navigate(page_name)
 
 if __name__ == "__main__":
+    from navigator import get_navigator
+
     app = QApplication(sys.argv)
-    window = LoginWindow()
+    window = get_navigator()
+    window.navigate("LoginWindow")
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,8 +1,14 @@
+import os
 import sys
 from PyQt6.QtWidgets import QApplication
-from landing import LandingPage
+from navigator import get_navigator
+
+# **Storage Backend** - `--sqlite` runs on a local file instead of a MySQL server
+if "--sqlite" in sys.argv:
+    os.environ["EXPENSE_TRACKER_BACKEND"] = "sqlite"
 
 app = QApplication(sys.argv)
-window = LandingPage()  # Start on Landing Page
+window = get_navigator()
+window.navigate("LandingPage")  # Start on Landing Page
 window.show()
 sys.exit(app.exec())
\ No newline at end of file
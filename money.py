@@ -0,0 +1,110 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import total_ordering
+
+CENT = Decimal("0.01")
+MAX_CENTS = 9999999999  # The largest amount a DECIMAL(10,2) column holds, 99,999,999.99
+
+
+@total_ordering
+class Money:
+    """An amount of pesos held as whole centavos, so sums and comparisons are exact.
+
+    Formats like a Decimal (f"₱{amount:.2f}"). The database backends convert it
+    to and from their column type; nothing in the app goes through float.
+    """
+
+    __slots__ = ("cents",)
+
+    def __init__(self, cents=0):
+        if not isinstance(cents, int):
+            raise TypeError(f"Money needs whole centavos, got {cents!r}")
+        self.cents = cents
+
+    @classmethod
+    def parse(cls, text):
+        """Parses user input such as "1,250.50" or "₱99"; raises ValueError if it is not an amount.
+
+        Amounts beyond MAX_CENTS are rejected too, since the database could not store them.
+        """
+        cleaned = str(text).replace("₱", "").replace(",", "").strip()
+        try:
+            value = Decimal(cleaned)
+            rounded = value.quantize(CENT, rounding=ROUND_HALF_UP)
+        except InvalidOperation:  # Not a number, or too many digits to quantize ("1e30")
+            raise ValueError(f"invalid amount '{text}'")
+        if not value.is_finite():
+            raise ValueError(f"invalid amount '{text}'")
+        if value != rounded:
+            raise ValueError(f"amounts have at most two decimal places: '{text}'")
+        amount = cls(int(rounded * 100))
+        if abs(amount.cents) > MAX_CENTS:
+            raise ValueError(f"amounts can be at most {cls(MAX_CENTS):,.2f}: '{text}'")
+        return amount
+
+    @classmethod
+    def parse_expense(cls, text):
+        """Parses an expense's amount: parse(), and it must be more than zero."""
+        return cls.parse(text).check_expense()
+
+    def check_expense(self):
+        """Returns the amount if an expense can have it (more than zero); raises ValueError otherwise."""
+        if self.cents <= 0:
+            raise ValueError(f"expense amounts must be more than zero, got {self}")
+        return self
+
+    @classmethod
+    def from_decimal(cls, value):
+        """Converts a Decimal, int or numeric string, rounding half up to the centavo."""
+        return cls(int(Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP) * 100))
+
+    def to_decimal(self):
+        return Decimal(self.cents).scaleb(-2)
+
+    # **Arithmetic**
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if other == 0:  # Lets sum() start from its default 0
+            return self
+        return NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+    def __bool__(self):
+        return self.cents != 0
+
+    # **Comparison**
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.cents)
+
+    # **Formatting**
+    def __str__(self):
+        return str(self.to_decimal())
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __format__(self, spec):
+        return format(self.to_decimal(), spec) if spec else str(self)
@@ -0,0 +1,99 @@
+import importlib
+from collections import OrderedDict
+from PyQt6.QtWidgets import QStackedWidget
+from theme import apply_theme, saved_theme
+
+# Page name -> (module, class); modules are imported the first time a page is shown
+PAGES = {
+    "LandingPage": ("landing", "LandingPage"),
+    "LoginWindow": ("login", "LoginWindow"),
+    "RegistrationWindow": ("register", "RegistrationWindow"),
+    "AboutPage": ("about", "AboutPage"),
+    "GuidePage": ("guide", "GuidePage"),
+    "Dashboard": ("dashboard", "Dashboard")
+}
+PAGE_CACHE_SIZE = 4
+
+_navigator = None
+
+
+class Navigator(QStackedWidget):
+    """The app's single window; pages are built once, kept in an LRU cache and reused.
+
+    Pages may define reset_state() (called when a cached page is shown again) and
+    on_leave() (called when another page replaces it). The size a page gives
+    itself with resize() is applied to the window when that page is shown.
+    """
+
+    def __init__(self, cache_size=PAGE_CACHE_SIZE):
+        super().__init__()
+        self.cache_size = cache_size
+        self._pages = OrderedDict()
+        self._preferred_sizes = {}  # Page name -> the size the page asked for, before the stack resized it
+        self.setWindowTitle("Personal Expense Tracker")
+        self.resize(500, 400)
+        apply_theme(saved_theme())  # One app-wide stylesheet, installed before any page is built
+
+    def navigate(self, page_name):
+        """Shows a page, building it only if it is not cached."""
+        current = self.currentWidget()
+        page = self._pages.pop(page_name, None)
+
+        if page is None:
+            module_name, class_name = PAGES[page_name]
+            page_class = getattr(importlib.import_module(module_name), class_name)
+            page = page_class()
+            self._preferred_sizes[page_name] = page.size()
+            page.setAutoFillBackground(True)  # Child widgets only paint their palette when asked
+            self.addWidget(page)
+        elif page is not current and hasattr(page, "reset_state"):
+            page.reset_state()
+
+        self._pages[page_name] = page
+
+        if current is not None and current is not page and hasattr(current, "on_leave"):
+            current.on_leave()
+
+        self.setCurrentWidget(page)
+        self.setWindowTitle(page.windowTitle())
+        self._apply_size(page_name, current)
+        self._trim_cache()
+        return page
+
+    def _apply_size(self, page_name, previous):
+        """Resizes the window for a page, unless the page before it wanted the same size (keeping the user's)."""
+        size = self._preferred_sizes[page_name]
+        previous_size = next(
+            (self._preferred_sizes.get(name) for name, page in self._pages.items() if page is previous), None
+        )
+        if previous is None or size != previous_size:
+            self.resize(size)
+
+    def evict(self, page_name):
+        """Drops a cached page so the next visit builds it fresh (e.g. the dashboard on logout)."""
+        page = self._pages.pop(page_name, None)
+        if page is not None and page is not self.currentWidget():
+            self._destroy(page)
+        elif page is not None:
+            self._pages[page_name] = page  # Cannot remove the page on screen; keep it cached
+
+    def _trim_cache(self):
+        current = self.currentWidget()
+        for page_name in list(self._pages):
+            if len(self._pages) <= self.cache_size:
+                break
+            if self._pages[page_name] is not current:
+                self._destroy(self._pages.pop(page_name))
+
+    def _destroy(self, page):
+        self.removeWidget(page)
+        page.close()  # Runs the page's closeEvent cleanup
+        page.deleteLater()
+
+
+def get_navigator():
+    """Returns the shared navigator window, creating it on first use."""
+    global _navigator
+    if _navigator is None:
+        _navigator = Navigator()
+    return _navigator
@@ -0,0 +1,41 @@
+import calendar
+from datetime import timedelta
+
+# Label shown in the add-expense form -> value stored in recurring_expenses.frequency
+FREQUENCIES = {
+    "Daily": "daily",
+    "Weekly": "weekly",
+    "Monthly": "monthly",
+    "Yearly": "yearly"
+}
+MAX_CATCH_UP = 5000  # Occurrences per template per run; any rest follows on the next run
+
+
+def _add_months(day, months, anchor_day):
+    index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(index, 12)
+    month += 1
+    return day.replace(year=year, month=month, day=min(anchor_day, calendar.monthrange(year, month)[1]))
+
+
+def next_occurrence(day, frequency, anchor_day):
+    """Returns the occurrence after `day`; monthly and yearly ones keep `anchor_day` (the 31st becomes the 30th, 28th...)."""
+    if frequency == "daily":
+        return day + timedelta(days=1)
+    if frequency == "weekly":
+        return day + timedelta(weeks=1)
+    if frequency == "monthly":
+        return _add_months(day, 1, anchor_day)
+    if frequency == "yearly":
+        return _add_months(day, 12, anchor_day)
+    raise ValueError(f"unknown frequency '{frequency}'")
+
+
+def due_dates(next_run, frequency, anchor_day, today, limit=MAX_CATCH_UP):
+    """Returns ([every occurrence from next_run up to today], the next_run after them)."""
+    dates = []
+    day = next_run
+    while day <= today and len(dates) < limit:
+        dates.append(day)
+        day = next_occurrence(day, frequency, anchor_day)
+    return dates, day
@@ -0,0 +1,79 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
+)
+import database
+from recurring import FREQUENCIES
+from theme import style
+
+FREQUENCY_LABELS = {value: label for label, value in FREQUENCIES.items()}
+
+
+class RecurringDialog(QDialog):
+    """Lists a user's recurring expenses and lets them stop one."""
+
+    def __init__(self, tasks, user_id, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Recurring Expenses")
+        self.resize(520, 320)
+        self.tasks = tasks
+        self.user_id = user_id
+        self.template_ids = []
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Category", "Amount (₱)", "Repeats", "Next"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+
+        self.stop_button = QPushButton("Stop Repeating")
+        style(self.stop_button, "action", "red")
+        self.stop_button.clicked.connect(self.stop_selected)
+
+        self.close_button = QPushButton("Close")
+        style(self.close_button, "action", "blue")
+        self.close_button.clicked.connect(self.accept)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(self.stop_button)
+        button_layout.addWidget(self.close_button)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.table)
+        layout.addLayout(button_layout)
+
+        self.reload()
+
+    def reload(self):
+        self.tasks.run(
+            database.fetch_recurring, self.user_id,
+            on_success=self.show_templates,
+            on_error=lambda error: QMessageBox.critical(self, "Database Error", f"Error: {error}")
+        )
+
+    def show_templates(self, templates):
+        self.template_ids = [template[0] for template in templates]
+        self.table.setRowCount(len(templates))
+        for row, (_, expense_type, amount, frequency, _, next_run) in enumerate(templates):
+            self.table.setItem(row, 0, QTableWidgetItem(expense_type))
+            self.table.setItem(row, 1, QTableWidgetItem(f"{amount:,.2f}"))
+            self.table.setItem(row, 2, QTableWidgetItem(FREQUENCY_LABELS.get(frequency, frequency)))
+            self.table.setItem(row, 3, QTableWidgetItem(next_run.strftime("%Y-%m-%d")))
+
+    def stop_selected(self):
+        """Deletes the selected template; the expenses it already added stay."""
+        row = self.table.currentRow()
+        if row < 0:
+            return
+        expense_type = self.table.item(row, 0).text()
+        confirmation = QMessageBox.question(self, "Stop Repeating", f"Stop repeating '{expense_type}'?",
+                                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if confirmation != QMessageBox.StandardButton.Yes:
+            return
+
+        self.tasks.run(
+            database.delete_recurring, self.user_id, self.template_ids[row],
+            on_success=lambda _: self.reload(),
+            on_error=lambda error: QMessageBox.critical(self, "Database Error", f"Error: {error}")
+        )
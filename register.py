@@ -1,26 +1,14 @@
 import sys
 import re
-import mysql.connector
-from bcrypt import hashpw, gensalt
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout,
     QHBoxLayout, QLineEdit, QFrame, QMessageBox
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap, QPalette, QBrush
-
-# Database connection
-try:
-    db = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",
-        database="expense_tracker"
-    )
-    cursor = db.cursor()
-except mysql.connector.Error as e:
-    print(f"Database connection failed: {e}")
-    db = None
+from image_cache import install_background
+from theme import style
+import auth
+from workers import TaskRunner
 
 class RegistrationWindow(QWidget):
     def __init__(self):
@@ -28,26 +16,22 @@ class RegistrationWindow(QWidget):
 
         self.setWindowTitle("Personal Expense Tracker Registration")
         self.resize(500, 400)
+        self.tasks = TaskRunner(self)
 
         # **Background Image**
-        palette = QPalette()
-        bg_image = QPixmap("bg2.jpg")
-        palette.setBrush(QPalette.ColorRole.Window, QBrush(bg_image))
-        self.setPalette(palette)
+        install_background(self, "bg2.jpg")
 
         main_layout = QVBoxLayout(self)
         self.setLayout(main_layout)
 
         # **Navbar**
         navbar_layout = QHBoxLayout()
-        button_style = "padding: 8px; font-size: 16px; border-radius: 5px; background-color: white; color: black;"
-
         self.home_button = QPushButton("Home")
-        self.home_button.setStyleSheet(button_style)
+        style(self.home_button, "nav")
         self.register_nav_button = QPushButton("Register")
-        self.register_nav_button.setStyleSheet(button_style)
+        style(self.register_nav_button, "nav")
         self.login_nav_button = QPushButton("Login")
-        self.login_nav_button.setStyleSheet(button_style)
+        style(self.login_nav_button, "nav")
 
         self.home_button.clicked.connect(lambda: self.switch_page("LandingPage"))
         self.register_nav_button.clicked.connect(lambda: self.switch_page("RegistrationWindow"))
@@ -60,15 +44,12 @@ class RegistrationWindow(QWidget):
 
         # **Content Container**
         content_container = QFrame()
-        content_container.setStyleSheet(
-            "border: 2px solid white; padding: 20px; border-radius: 10px; "
-            "background-color: rgba(255, 255, 255, 0.95);"
-        )
+        style(content_container, "card")
         content_layout = QVBoxLayout(content_container)
 
         # **Header**
         self.page_header = QLabel("Personal Expense Tracker Registration")
-        self.page_header.setStyleSheet("font-size: 30px; font-weight: bold; color: black;")
+        style(self.page_header, "pageTitle")
         self.page_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(self.page_header)
 
@@ -78,35 +59,30 @@ class RegistrationWindow(QWidget):
             "Securely store and analyze your financial data.\n"
             "Register now to take control of your finances!"
         )
-        self.system_description_label.setStyleSheet("font-size: 14px; color: black; font-weight: bold")
+        style(self.system_description_label, "description")
         self.system_description_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(self.system_description_label)
 
         # **Registration Form**
-        input_style = "padding: 6px; font-size: 14px; border-radius: 5px; background-color: white; color: black; width: 250px;"
-
         self.username_input = QLineEdit()
         self.username_input.setPlaceholderText("Enter Username")
-        self.username_input.setStyleSheet(input_style)
+        style(self.username_input, "input")
         content_layout.addWidget(self.username_input, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.email_input = QLineEdit()
         self.email_input.setPlaceholderText("Enter Email")
-        self.email_input.setStyleSheet(input_style)
+        style(self.email_input, "input")
         content_layout.addWidget(self.email_input, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.password_input = QLineEdit()
         self.password_input.setPlaceholderText("Enter Password")
         self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
-        self.password_input.setStyleSheet(input_style)
+        style(self.password_input, "input")
         content_layout.addWidget(self.password_input, alignment=Qt.AlignmentFlag.AlignCenter)
 
         # **Register Button**
         self.register_button = QPushButton("Register")
-        self.register_button.setStyleSheet(
-            "padding: 12px; font-size: 18px; font-weight: bold; border-radius: 5px; "
-            "background-color: #007BFF; color: white; width: 200px;"
-        )
+        style(self.register_button, "primary", "blue")
         self.register_button.clicked.connect(self.validate_form)
         content_layout.addWidget(self.register_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
@@ -116,10 +92,6 @@ class RegistrationWindow(QWidget):
 
     def validate_form(self):
         """Ensures fields are filled before submission and validates email format."""
-        if not db:
-            QMessageBox.critical(self, "Database Error", "Database connection failed!")
-            return
-
         username = self.username_input.text().strip()
         email = self.email_input.text().strip()
         password = self.password_input.text().strip()
@@ -133,36 +105,55 @@ class RegistrationWindow(QWidget):
             QMessageBox.warning(self, "Validation Error", "Enter a valid email address!")
             return
 
-        # **Hash password before storing**
-        hashed_password = hashpw(password.encode(), gensalt()).decode()
+        # **Hash and store on a worker thread** - bcrypt is deliberately slow
+        self.set_loading(True)
+        self.tasks.run(
+            auth.register_user, username, email, password,
+            on_success=self.on_user_created,
+            on_error=self.show_database_error
+        )
 
-        try:
-            cursor.execute("INSERT INTO users (username, email, password) VALUES (%s, %s, %s)", (username, email, hashed_password))
-            db.commit()
-            QMessageBox.information(self, "Success", "Registration successful!")
-            self.switch_page("LoginWindow")
-        except mysql.connector.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Error: {e}")
+    def on_user_created(self, _user_id):
+        """Moves on to the login page once the account is stored."""
+        self.set_loading(False)
+        QMessageBox.information(self, "Success", "Registration successful!")
+        self.switch_page("LoginWindow")
+
+    def show_database_error(self, error):
+        """Reports a failed background query."""
+        self.set_loading(False)
+        QMessageBox.critical(self, "Database Error", f"Error: {error}")
+
+    def set_loading(self, loading):
+        """Disables the form while a registration request is in flight."""
+        self.register_button.setEnabled(not loading)
+        self.register_button.setText("Registering..." if loading else "Register")
+
+    def closeEvent(self, event):
+        """Cancels a pending registration request when the window closes."""
+        self.tasks.cancel_all()
+        super().closeEvent(event)
+
+    def on_leave(self):
+        """Drops a pending registration request when the user navigates away."""
+        self.tasks.cancel_all()
+        self.set_loading(False)
+
+    def reset_state(self):
+        """Clears the form when the cached page is shown again."""
+        for field in (self.username_input, self.email_input, self.password_input):
+            field.clear()
 
     def switch_page(self, page_name):
-        """Closes current window and opens a new one while maintaining window size."""
-        current_size = self.size()
-        self.close()
-
-        if page_name == "LoginWindow":
-            from login import LoginWindow
-            new_page = LoginWindow()
-        elif page_name == "LandingPage":
-            from landing import LandingPage
-            new_page = LandingPage()
-        elif page_name == "RegistrationWindow":
-            new_page = RegistrationWindow()
-
-        new_page.resize(current_size)
-        new_page.show()
+        """Shows another page in the shared window, reusing it if it was built before."""
+        from navigator import get_navigator
+        get_navigator().navigate(page_name)
 
 if __name__ == "__main__":
+    from navigator import get_navigator
+
     app = QApplication(sys.argv)
-    window = RegistrationWindow()
+    window = get_navigator()
+    window.navigate("RegistrationWindow")
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
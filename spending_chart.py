@@ -0,0 +1,145 @@
+from datetime import date
+from PyQt6.QtWidgets import QGroupBox, QVBoxLayout, QWidget
+from PyQt6.QtCore import Qt, QPointF, QRectF, QTimer
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
+import database
+from downsample import lttb, min_max
+from expense_query import ExpenseFilter
+from money import Money
+import theme
+from theme import style
+
+MAX_POINTS = 2000        # Most points a series keeps after LTTB, whatever the history length
+FILTER_DELAY_MS = 400
+GRID_LINES = 4
+MARGINS = (72, 10, 12, 24)  # left, top, right, bottom
+
+
+def load_spending_series(user_id, criteria, max_points=MAX_POINTS):
+    """Returns the chart's (day ordinal, centavos) points. Meant for a worker thread."""
+    points = [(day.toordinal(), total.cents) for day, total in database.fetch_daily_spending(user_id, criteria)]
+    return lttb(points, max_points)
+
+
+class SpendingChart(QWidget):
+    """Draws a daily spending series with QPainter.
+
+    The series arrives already bucketed per day and reduced with LTTB; on each
+    resize it is cut down again to a min/max pair per pixel column, so a paint
+    never handles more vertices than the plot is wide.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(160)
+        self.points = []
+        self.y_max = 1
+        self._polyline = None
+
+    def set_points(self, points):
+        self.points = points
+        self.y_max = max((y for _, y in points), default=0) or 1
+        self._polyline = None
+        self.update()
+
+    def resizeEvent(self, event):
+        self._polyline = None
+        super().resizeEvent(event)
+
+    def _plot_rect(self):
+        left, top, right, bottom = MARGINS
+        return QRectF(self.rect()).adjusted(left, top, -right, -bottom)
+
+    def _build_polyline(self, rect):
+        x_start, x_end = self.points[0][0], self.points[-1][0]
+        x_scale = rect.width() / (x_end - x_start) if x_end > x_start else 0
+        y_scale = rect.height() / self.y_max
+        visible = min_max(self.points, x_start, x_end, max(int(rect.width()), 1))
+        return QPolygonF([
+            QPointF(rect.left() + (x - x_start) * x_scale, rect.bottom() - y * y_scale) for x, y in visible
+        ])
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        text_color = QColor(theme.color("panel_fg"))
+
+        if not self.points:
+            painter.setPen(text_color)
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "No spending in this range")
+            return
+
+        rect = self._plot_rect()
+        if self._polyline is None:
+            self._polyline = self._build_polyline(rect)
+
+        # **Axes**
+        painter.setPen(QPen(QColor(theme.color("muted")), 1, Qt.PenStyle.DotLine))
+        for step in range(GRID_LINES + 1):
+            y = rect.bottom() - rect.height() * step / GRID_LINES
+            painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+
+        painter.setPen(text_color)
+        for step in range(GRID_LINES + 1):
+            y = rect.bottom() - rect.height() * step / GRID_LINES
+            label = f"₱{Money(self.y_max * step // GRID_LINES):,.0f}"
+            painter.drawText(QRectF(0, y - 8, MARGINS[0] - 6, 16), Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, label)
+
+        label_row = QRectF(rect.left(), rect.bottom() + 4, rect.width(), MARGINS[3] - 4)
+        painter.drawText(label_row, Qt.AlignmentFlag.AlignLeft, date.fromordinal(self.points[0][0]).strftime("%b %d, %Y"))
+        painter.drawText(label_row, Qt.AlignmentFlag.AlignRight, date.fromordinal(self.points[-1][0]).strftime("%b %d, %Y"))
+
+        # **Series**
+        painter.setPen(QPen(QColor(theme.color("chart_line")), 1.5))
+        if len(self._polyline) == 1:
+            painter.drawEllipse(self._polyline[0], 2, 2)
+        else:
+            painter.drawPolyline(self._polyline)
+
+
+class SpendingChartPanel(QGroupBox):
+    """Loads the spending series for the dashboard's user and filter on a worker thread."""
+
+    def __init__(self, tasks, parent=None):
+        super().__init__("Spending Over Time", parent)
+        self.tasks = tasks
+        style(self, "panel")
+        self.user_id = None
+        self.criteria = ExpenseFilter()
+        self._generation = 0
+
+        self.chart = SpendingChart()
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.chart)
+
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.timeout.connect(self.reload)
+
+    def refresh(self, user_id):
+        """Reloads the series, e.g. after the user's expenses changed."""
+        self.user_id = user_id
+        self.reload()
+
+    def set_filter(self, criteria):
+        """Follows the filter bar once typing pauses; amount bounds do not apply to daily totals."""
+        self.criteria = criteria
+        self.filter_timer.start(FILTER_DELAY_MS)
+
+    def reload(self):
+        if self.user_id is None:
+            return
+        self._generation += 1
+        generation = self._generation
+        self.tasks.run(
+            load_spending_series, self.user_id, self.criteria,
+            on_success=lambda points: self._on_series_loaded(generation, points)
+        )
+
+    def _on_series_loaded(self, generation, points):
+        if generation == self._generation:  # A newer filter superseded this one
+            self.chart.set_points(points)
+
+    def stop(self):
+        """Drops a pending filter reload when the page closes."""
+        self.filter_timer.stop()
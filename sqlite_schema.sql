@@ -0,0 +1,56 @@
+--
+-- SQLite version of the schema in expense_tracker.sql, used by the embedded
+-- storage backend. Keep the two files in step. Money columns hold INTEGER
+-- centavos here (SQLite has no exact decimal type); the backend converts.
+--
+
+CREATE TABLE IF NOT EXISTS `users` (
+  `id` INTEGER PRIMARY KEY AUTOINCREMENT,
+  `username` varchar(255) NOT NULL,
+  `email` varchar(255) NOT NULL,
+  `password` varchar(255) NOT NULL,
+  `expense_version` int(11) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS `expenses` (
+  `id` INTEGER PRIMARY KEY AUTOINCREMENT,
+  `user_id` int(11) DEFAULT NULL REFERENCES `users` (`id`) ON DELETE CASCADE,
+  `expense_type` varchar(255) DEFAULT NULL,
+  `amount` integer DEFAULT NULL,
+  `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `client_key` char(32) DEFAULT NULL UNIQUE
+);
+
+CREATE INDEX IF NOT EXISTS `user_created_at` ON `expenses` (`user_id`, `created_at`);
+CREATE INDEX IF NOT EXISTS `user_type_created_at` ON `expenses` (`user_id`, `expense_type`, `created_at`);
+CREATE INDEX IF NOT EXISTS `user_amount` ON `expenses` (`user_id`, `amount`);
+
+CREATE TABLE IF NOT EXISTS `expense_daily_rollup` (
+  `user_id` int(11) NOT NULL REFERENCES `users` (`id`) ON DELETE CASCADE,
+  `day` date NOT NULL,
+  `expense_type` varchar(255) NOT NULL,
+  `total` integer NOT NULL DEFAULT 0,
+  `count` int(11) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`user_id`, `day`, `expense_type`)
+);
+
+CREATE TABLE IF NOT EXISTS `budgets` (
+  `user_id` int(11) NOT NULL REFERENCES `users` (`id`) ON DELETE CASCADE,
+  `expense_type` varchar(255) NOT NULL,
+  `monthly_limit` integer NOT NULL,
+  `month` date NOT NULL,
+  `spent` integer NOT NULL DEFAULT 0,
+  PRIMARY KEY (`user_id`, `expense_type`)
+);
+
+CREATE TABLE IF NOT EXISTS `recurring_expenses` (
+  `id` INTEGER PRIMARY KEY AUTOINCREMENT,
+  `user_id` int(11) NOT NULL REFERENCES `users` (`id`) ON DELETE CASCADE,
+  `expense_type` varchar(255) NOT NULL,
+  `amount` integer NOT NULL,
+  `frequency` varchar(10) NOT NULL,
+  `start_date` date NOT NULL,
+  `next_run` date NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS `user_next_run` ON `recurring_expenses` (`user_id`, `next_run`);
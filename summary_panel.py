@@ -0,0 +1,82 @@
+import calendar
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import (
+    QGroupBox, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+)
+import database
+from expense_cache import get_expense_cache
+from theme import style
+
+
+class SummaryPanel(QGroupBox):
+    """Shows the user's spend per category and per month, aggregated by the database."""
+
+    summary_loaded = pyqtSignal(object, object, object)  # user_id, expense_version it was read at, summary
+
+    def __init__(self, tasks, parent=None):
+        super().__init__("Summary", parent)
+        self.tasks = tasks
+        style(self, "panel")
+        self.setObjectName("summaryPanel")
+
+        layout = QVBoxLayout(self)
+
+        self.total_label = QLabel("Total: ₱0.00")
+        style(self.total_label, "total")
+        layout.addWidget(self.total_label)
+
+        self.category_table = self._make_table(["Category", "Total (₱)"])
+        layout.addWidget(QLabel("By Category"))
+        layout.addWidget(self.category_table)
+
+        self.month_table = self._make_table(["Month", "Total (₱)"])
+        layout.addWidget(QLabel("By Month"))
+        layout.addWidget(self.month_table)
+
+    def _make_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        return table
+
+    def refresh(self, user_id):
+        """Shows the cached summary, or re-runs the GROUP BY queries on a worker thread."""
+        entry = get_expense_cache().get(user_id)
+        if entry is not None and entry.summary is not None:
+            self.show_summary(entry.summary)
+            self.summary_loaded.emit(user_id, entry.version, entry.summary)
+            return
+
+        version = entry.version if entry is not None else None
+        self.tasks.run(
+            database.fetch_summary, user_id,
+            on_success=lambda summary: self._on_summary_loaded(user_id, version, summary)
+        )
+
+    def _on_summary_loaded(self, user_id, version, summary):
+        entry = get_expense_cache().get(user_id)
+        if entry is not None and entry.version == version:
+            entry.summary = summary  # Only if no write landed while the query ran
+        self.show_summary(summary)
+        self.summary_loaded.emit(user_id, version, summary)
+
+    def show_summary(self, summary):
+        """Fills both tables from a fetch_summary() result."""
+        by_type = summary["by_type"]
+        by_month = summary["by_month"]
+
+        total = sum(amount for _, amount, _ in by_type)
+        self.total_label.setText(f"Total: ₱{total:.2f}")
+
+        self._fill(self.category_table, [(expense_type, amount) for expense_type, amount, _ in by_type])
+        self._fill(self.month_table, [
+            (f"{calendar.month_abbr[month]} {year}", amount) for year, month, amount in by_month
+        ])
+
+    def _fill(self, table, rows):
+        table.setRowCount(len(rows))
+        for row, (label, amount) in enumerate(rows):
+            table.setItem(row, 0, QTableWidgetItem(label))
+            table.setItem(row, 1, QTableWidgetItem(f"₱{amount:.2f}"))
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules live at the repository root, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from backends import SQLiteBackend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    """Points the database module at a fresh SQLite file for one test."""
+    backend = SQLiteBackend(str(tmp_path / "expense_tracker.db"))
+    database.use_backend(backend)
+    yield backend
+    database.use_backend(None)
+
+
+@pytest.fixture
+def user_id(backend):
+    return database.create_user("gio", "gio@example.com", "hash")
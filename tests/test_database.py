@@ -0,0 +1,136 @@
+import sqlite3
+from datetime import date, datetime
+
+import database
+from backends import SQLITE_SCHEMA_VERSION, SQLiteBackend
+from money import Money
+
+
+def _rollup(user_id):
+    return database.fetch_all(
+        "SELECT day, expense_type, total, count FROM expense_daily_rollup WHERE user_id = %s ORDER BY day, expense_type",
+        (user_id,)
+    )
+
+
+def test_writes_keep_rollup_budget_and_version_in_step(user_id):
+    now = datetime.now().replace(microsecond=0)
+    database.set_budget(user_id, "Food", Money.parse("1000"))
+
+    expense_id = database.insert_expense(user_id, "Food", Money.parse("120.50"), now)
+    assert database.fetch_expense_version(user_id) == 1
+    assert _rollup(user_id) == [(now.date(), "Food", 12050, 1)]
+    assert database.fetch_budgets(user_id)[0][3] == Money.parse("120.50")
+
+    assert database.update_expense(user_id, expense_id, "Bills", Money.parse("80")) == 2
+    assert _rollup(user_id) == [(now.date(), "Bills", 8000, 1), (now.date(), "Food", 0, 0)]
+    assert database.fetch_budgets(user_id)[0][3] == Money()
+
+    assert database.delete_expense(user_id, expense_id) == 3
+    assert _rollup(user_id) == [(now.date(), "Bills", 0, 0), (now.date(), "Food", 0, 0)]
+    assert database.count_user_expenses(user_id) == 0
+    assert database.fetch_summary(user_id) == {"by_type": [], "by_month": []}
+
+
+def test_missing_expense_is_not_updated_or_deleted(user_id):
+    assert database.update_expense(user_id, 404, "Food", Money.parse("1")) is None
+    assert database.delete_expense(user_id, 404) is None
+    assert database.fetch_expense_version(user_id) == 0
+
+
+def test_queued_expenses_apply_once(user_id):
+    entries = [
+        ("a" * 32, user_id, "Food", Money.parse("10"), datetime(2025, 1, 1, 8)),
+        ("b" * 32, user_id, "Food", Money.parse("5.25"), datetime(2025, 1, 1, 9))
+    ]
+    ids, versions = database.apply_queued_expenses(entries)
+    assert set(ids) == {"a" * 32, "b" * 32}
+    assert versions == {user_id: 1}
+
+    # A retry after a lost acknowledgement returns the same ids and writes nothing
+    retry_ids, retry_versions = database.apply_queued_expenses(entries)
+    assert retry_ids == ids
+    assert retry_versions == {user_id: 2}
+    assert database.count_user_expenses(user_id) == 2
+    assert _rollup(user_id) == [(date(2025, 1, 1), "Food", 1525, 2)]
+    assert len(database.fetch_expense_page(user_id)) == 2
+
+
+def test_recurring_catches_up_every_missed_occurrence(user_id):
+    template_id = database.add_recurring(user_id, "Rent", Money.parse("8000"), "monthly", date(2025, 1, 31))
+
+    written, version = database.materialize_recurring(user_id, date(2025, 4, 15))
+    assert (written, version) == (3, 1)
+    assert [row[3].date() for row in database.fetch_expense_page(user_id)] == [
+        date(2025, 3, 31), date(2025, 2, 28), date(2025, 1, 31)
+    ]
+    assert database.fetch_recurring(user_id)[0][0] == template_id
+    assert database.fetch_next_recurring_run(user_id) == date(2025, 4, 30)
+
+    # Nothing is due again until the next occurrence
+    assert database.materialize_recurring(user_id, date(2025, 4, 15)) == (0, None)
+    assert database.count_user_expenses(user_id) == 3
+
+
+# The embedded schema as first released: REAL peso amounts, no user_version
+VERSION_0_SCHEMA = """
+CREATE TABLE `users` (
+  `id` INTEGER PRIMARY KEY AUTOINCREMENT,
+  `username` varchar(255) NOT NULL,
+  `email` varchar(255) NOT NULL,
+  `password` varchar(255) NOT NULL
+);
+CREATE TABLE `expenses` (
+  `id` INTEGER PRIMARY KEY AUTOINCREMENT,
+  `user_id` int(11) DEFAULT NULL REFERENCES `users` (`id`) ON DELETE CASCADE,
+  `expense_type` varchar(255) DEFAULT NULL,
+  `amount` decimal(10,2) DEFAULT NULL,
+  `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX `user_created_at` ON `expenses` (`user_id`, `created_at`, `amount`);
+CREATE INDEX `user_type_amount` ON `expenses` (`user_id`, `expense_type`, `amount`);
+CREATE TABLE `expense_daily_rollup` (
+  `user_id` int(11) NOT NULL REFERENCES `users` (`id`) ON DELETE CASCADE,
+  `day` date NOT NULL,
+  `expense_type` varchar(255) NOT NULL,
+  `total` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `count` int(11) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`user_id`, `day`, `expense_type`)
+);
+INSERT INTO users (id, username, email, password) VALUES (6, 'gio', 'gio@example.com', 'hash');
+INSERT INTO expenses (user_id, expense_type, amount, created_at) VALUES (6, 'Food', 12.5, '2025-05-09 14:21:11');
+INSERT INTO expenses (user_id, expense_type, amount, created_at) VALUES (6, 'Food', 0.1, '2025-05-09 15:00:00');
+INSERT INTO expense_daily_rollup VALUES (6, '2025-05-09', 'Food', 12.6, 2);
+"""
+
+
+def test_version_0_file_is_upgraded(tmp_path):
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.executescript(VERSION_0_SCHEMA)
+    connection.close()
+
+    database.use_backend(SQLiteBackend(path))
+    try:
+        assert [row[2] for row in database.fetch_expense_page(6)] == [Money.parse("0.10"), Money.parse("12.50")]
+        assert database.fetch_totals_by_type(6) == [("Food", Money.parse("12.60"), 2)]
+        assert database.fetch_expense_version(6) == 0
+
+        version = database.fetch_one("PRAGMA user_version")[0]
+        columns = [row[2] for row in database.fetch_all("PRAGMA index_info(user_created_at)")]
+        assert version == SQLITE_SCHEMA_VERSION
+        assert columns == ["user_id", "created_at"]
+
+        # The upgraded file takes queued writes like a new one
+        ids, _ = database.apply_queued_expenses([("c" * 32, 6, "Bills", Money.parse("1"), datetime(2025, 5, 10))])
+        assert database.fetch_expense_version(6) == 1
+        assert list(ids) == ["c" * 32]
+    finally:
+        database.use_backend(None)
+
+    # Opening it again finds it current and changes nothing
+    database.use_backend(SQLiteBackend(path))
+    try:
+        assert database.fetch_totals_by_type(6)[0] == ("Food", Money.parse("12.60"), 2)
+    finally:
+        database.use_backend(None)
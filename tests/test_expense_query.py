@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pytest
+
+import check_query_plans
+from expense_query import ExpenseFilter, build_expense_query, build_spending_query
+from money import Money
+
+KNOWN_TYPES = ["Food", "Fast food", "Bills", "Transportation"]
+
+
+@pytest.mark.parametrize("label", [label for label, _, _ in check_query_plans.query_shapes(6)])
+def test_query_shapes_use_an_index(backend, label):
+    _, sql, params = next(shape for shape in check_query_plans.query_shapes(6) if shape[0] == label)
+    details, scans = check_query_plans.full_scans(backend, sql, params)
+    if label in check_query_plans.KEYSET_ORDERED:
+        scans = scans + check_query_plans.sorts(backend, details)
+    assert not scans, details
+
+
+def test_unfiltered_page_is_keyset_ordered():
+    sql, params = build_expense_query(6, ExpenseFilter())
+    assert "WHERE user_id = %s ORDER BY created_at DESC, id DESC LIMIT %s" in sql
+    assert params == [6, 200]
+
+
+def test_next_page_continues_after_the_last_row():
+    after = (datetime(2024, 6, 1), 1000)
+    sql, params = build_expense_query(6, ExpenseFilter(), after=after, limit=50)
+    assert "(created_at < %s OR (created_at = %s AND id < %s))" in sql
+    assert params == [6, after[0], after[0], 1000, 50]
+
+    sql, params = build_expense_query(6, ExpenseFilter(), order_by="amount", descending=False, after=(Money(500), 7))
+    assert "(amount > %s OR (amount = %s AND id > %s))" in sql
+    assert "ORDER BY amount ASC, id ASC" in sql
+
+
+def test_text_becomes_a_type_list():
+    sql, params = build_expense_query(6, ExpenseFilter(text="foo"), KNOWN_TYPES)
+    assert "expense_type IN (%s, %s)" in sql
+    assert "LIKE" not in sql
+    assert params == [6, "Fast food", "Food", 200]
+
+
+def test_text_narrows_selected_types():
+    sql, params = build_expense_query(6, ExpenseFilter(text="fast", types=["Food", "Fast food"]), KNOWN_TYPES)
+    assert "expense_type IN (%s)" in sql
+    assert params == [6, "Fast food", 200]
+
+
+def test_no_matching_type_returns_none():
+    assert build_expense_query(6, ExpenseFilter(text="rent"), KNOWN_TYPES) is None
+    assert build_expense_query(6, ExpenseFilter(text="food", types=["Bills"]), KNOWN_TYPES) is None
+    assert build_spending_query(6, ExpenseFilter(text="rent"), KNOWN_TYPES) is None
+
+
+def test_amount_and_date_bounds():
+    criteria = ExpenseFilter(
+        min_amount=Money.parse("10"), max_amount=Money.parse("20"),
+        date_from=datetime(2024, 1, 1), date_to=datetime(2024, 2, 1)
+    )
+    sql, params = build_expense_query(6, criteria)
+    assert "amount >= %s AND amount <= %s AND created_at >= %s AND created_at < %s" in sql
+    assert params == [6, Money.parse("10"), Money.parse("20"), datetime(2024, 1, 1), datetime(2024, 2, 1), 200]
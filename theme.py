@@ -0,0 +1,146 @@
+from string import Template
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QSettings
+
+# **Themes** - only the colours differ; the rules below are shared
+THEMES = {
+    "light": {
+        "text": "black",
+        "nav_bg": "white",
+        "nav_fg": "black",
+        "card_bg": "rgba(255, 255, 255, 0.95)",
+        "card_border": "white",
+        "input_bg": "white",
+        "input_fg": "black",
+        "dash_start": "#30475E",
+        "dash_end": "#222831",
+        "panel_bg": "rgba(0, 0, 0, 0.6)",
+        "panel_fg": "white",
+        "muted": "#dddddd",
+        "chart_line": "#4FC3F7"
+    },
+    "dark": {
+        "text": "#EEEEEE",
+        "nav_bg": "#393E46",
+        "nav_fg": "#EEEEEE",
+        "card_bg": "rgba(34, 40, 49, 0.95)",
+        "card_border": "#393E46",
+        "input_bg": "#393E46",
+        "input_fg": "#EEEEEE",
+        "dash_start": "#1B1F24",
+        "dash_end": "#0F1114",
+        "panel_bg": "rgba(0, 0, 0, 0.75)",
+        "panel_fg": "#EEEEEE",
+        "muted": "#AAAAAA",
+        "chart_line": "#00ADB5"
+    }
+}
+DEFAULT_THEME = "light"
+
+# Widgets opt in with a "role" property (shape/typography) and a "tone" property (colour)
+STYLESHEET = Template("""
+QPushButton[role="nav"] {
+    padding: 8px; font-size: 16px; border-radius: 5px;
+    background-color: $nav_bg; color: $nav_fg;
+}
+QPushButton[role="primary"] {
+    padding: 12px; font-size: 18px; font-weight: bold; border-radius: 5px;
+    color: white; width: 200px;
+}
+QPushButton[role="action"] {
+    padding: 10px; font-size: 16px; font-weight: bold; border-radius: 5px;
+    color: white; width: 180px;
+}
+QPushButton[role="toolbar"] {
+    padding: 10px; font-size: 16px; font-weight: bold; border-radius: 5px; color: white;
+}
+QPushButton[role="submit"] {
+    padding: 14px; font-size: 20px; font-weight: bold; border-radius: 6px; color: white;
+}
+QPushButton[role="link"] {
+    padding: 8px; font-size: 14px; border-radius: 4px; color: white; width: 250px;
+}
+QPushButton[tone="blue"] { background-color: #007BFF; }
+QPushButton[tone="blue"]:hover { background-color: #0056b3; }
+QPushButton[tone="green"] { background-color: #28A745; }
+QPushButton[tone="green"]:hover { background-color: #218838; }
+QPushButton[tone="red"] { background-color: #dc3545; }
+QPushButton[tone="red"]:hover { background-color: #c82333; }
+
+QFrame[role="card"] {
+    border: 2px solid $card_border; padding: 20px; border-radius: 10px;
+    background-color: $card_bg;
+}
+QLabel[role="pageTitle"] { font-size: 30px; font-weight: bold; color: $text; }
+QLabel[role="sectionTitle"] { font-size: 24px; font-weight: bold; color: $text; }
+QLabel[role="subheading"] { font-size: 16px; font-weight: bold; color: $text; }
+QLabel[role="description"] { font-size: 14px; color: $text; font-weight: bold; }
+QTextEdit[role="article"] {
+    font-size: 14px; color: $text; font-weight: bold; border: none;
+    background-color: transparent;
+}
+QLineEdit[role="input"] {
+    padding: 6px; font-size: 14px; border-radius: 5px;
+    background-color: $input_bg; color: $input_fg; width: 250px;
+}
+
+QWidget#dashboard {
+    background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:1, stop:0 $dash_start, stop:1 $dash_end);
+}
+QLabel[role="dashboardTitle"] { font-size: 28px; font-weight: bold; color: white; padding: 12px; }
+QLabel[role="status"] { font-size: 14px; color: $muted; padding-left: 12px; }
+QGroupBox[role="panel"] {
+    border: 2px solid white; padding: 20px;
+    background-color: $panel_bg; color: $panel_fg;
+}
+QGroupBox#summaryPanel { padding: 10px; }
+QGroupBox[role="panel"] QLabel { color: $panel_fg; border: none; }
+QLabel[role="formLabel"] { font-size: 18px; }
+QLabel[role="total"] { font-size: 18px; font-weight: bold; }
+""")
+
+_compiled = {}
+_current = None
+
+
+def style(widget, role, tone=None):
+    """Tags a widget with the role (and colour tone) the app stylesheet styles it by."""
+    widget.setProperty("role", role)
+    if tone:
+        widget.setProperty("tone", tone)
+    return widget
+
+
+def stylesheet(name):
+    """Returns a theme's stylesheet, building the string once per theme."""
+    if name not in _compiled:
+        _compiled[name] = STYLESHEET.substitute(THEMES[name])
+    return _compiled[name]
+
+
+def color(key):
+    """Returns one colour of the active theme, for widgets that paint themselves."""
+    return THEMES[_current or saved_theme()][key]
+
+
+def saved_theme():
+    """Returns the theme the user picked last time."""
+    name = QSettings("MyApp", "ExpenseTracker").value("theme", DEFAULT_THEME)
+    return name if name in THEMES else DEFAULT_THEME
+
+
+def apply_theme(name):
+    """Installs one stylesheet for the whole app; Qt re-polishes existing widgets itself."""
+    global _current
+    if name == _current:
+        return
+    QApplication.instance().setStyleSheet(stylesheet(name))
+    QSettings("MyApp", "ExpenseTracker").setValue("theme", name)
+    _current = name
+
+
+def toggle_theme():
+    """Switches to the next theme at runtime."""
+    names = list(THEMES)
+    current = _current or saved_theme()
+    apply_theme(names[(names.index(current) + 1) % len(names)])
@@ -0,0 +1,120 @@
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+import database
+
+_pool = None
+
+
+def get_pool():
+    """Returns the thread pool every TaskRunner shares, created on first use.
+
+    It runs at most as many tasks as the backend has connections, so a burst of
+    queries waits in the pool's queue instead of exhausting the connection pool.
+    """
+    global _pool
+    if _pool is None:
+        _pool = QThreadPool()
+        _pool.setMaxThreadCount(database.get_backend().pool_size)
+    return _pool
+
+
+class TaskSignals(QObject):
+    """Carries a task's outcome back to the GUI thread."""
+
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    progress = pyqtSignal(int)
+
+
+class Task(QRunnable):
+    """Runs a callable on the shared thread pool and reports the result through signals."""
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self.cancelled = False
+        self.stop_requested = False
+        self.started = False
+        self.lock = threading.Lock()  # Orders cancel() against the start of run()
+
+    def cancel(self):
+        """Drops the task's result; a query already sent to the server still finishes there.
+
+        Returns True when the task had not started yet.
+        """
+        with self.lock:
+            self.cancelled = True
+            return not self.started
+
+    def request_stop(self):
+        """Asks a task that reports progress to stop early; unlike cancel(), its result is still delivered."""
+        self.stop_requested = True
+
+    def report_progress(self, percent):
+        """Emits progress from the worker; returns False once the task has been cancelled or asked to stop."""
+        keep_going = not (self.cancelled or self.stop_requested)
+        if keep_going:
+            self.signals.progress.emit(percent)
+        return keep_going
+
+    def run(self):
+        with self.lock:
+            if self.cancelled:
+                return
+            self.started = True
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(e)
+        else:
+            if not self.cancelled:
+                self.signals.succeeded.emit(result)
+
+
+class TaskRunner(QObject):
+    """Starts tasks for one page and cancels whatever is still pending when the page closes."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = get_pool()
+        self._pending = set()
+
+    def run(self, fn, *args, on_success=None, on_error=None, on_progress=None, **kwargs):
+        """Queues fn(*args, **kwargs) and calls on_success/on_error on the GUI thread.
+
+        With on_progress, fn also receives progress=<callable(percent) -> keep_going>.
+        """
+        task = Task(fn, *args, **kwargs)
+        self._pending.add(task)
+        if on_progress:
+            task.kwargs["progress"] = task.report_progress
+            task.signals.progress.connect(on_progress)
+
+        def finish(callback, value):
+            self._pending.discard(task)
+            if callback and not task.cancelled:
+                callback(value)
+
+        task.signals.succeeded.connect(lambda result: finish(on_success, result))
+        task.signals.failed.connect(lambda error: finish(on_error, error))
+        self.pool.start(task)
+        return task
+
+    def is_busy(self):
+        """Returns True while any task started by this runner is unfinished."""
+        return bool(self._pending)
+
+    def cancel_all(self):
+        """Cancels every pending task, pulling queued ones off the pool before they start.
+
+        A task that already started may have finished and been deleted by the pool
+        while its signal is still queued, so only unstarted ones are handed to tryTake().
+        """
+        for task in list(self._pending):
+            if task.cancel():
+                self.pool.tryTake(task)
+        self._pending.clear()
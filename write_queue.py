@@ -0,0 +1,163 @@
+import os
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+import database
+from money import Money
+
+QUEUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pending_writes.db")
+BATCH_SIZE = 200
+
+
+class WriteQueue:
+    """Durable local journal of expenses that have not reached the server yet.
+
+    add_expense writes here first (a local fsync, no network), so the UI can show
+    the row at once and nothing is lost while the database is unreachable. Each
+    entry carries a client_key that the server stores in a unique column, which
+    makes re-sending a batch after a lost acknowledgement harmless.
+
+    An entry the server rejects outright (bad data rather than no connection) is
+    moved to rejected_expenses, so it can't hold back the entries behind it.
+    """
+
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS pending_expenses (
+                    client_key TEXT PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    expense_type TEXT NOT NULL,
+                    amount TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT
+                )
+            """)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS rejected_expenses (
+                    client_key TEXT PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    expense_type TEXT NOT NULL,
+                    amount TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    last_error TEXT NOT NULL
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        """Opens a short-lived connection, so the queue is usable from any thread."""
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = FULL")
+            with connection:  # Commits on success, rolls back on error
+                yield connection
+        finally:
+            connection.close()
+
+    def enqueue(self, user_id, expense_type, amount, created_at):
+        """Durably records a new expense and returns its client_key."""
+        client_key = uuid.uuid4().hex
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO pending_expenses (client_key, user_id, expense_type, amount, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (client_key, user_id, expense_type, str(amount), created_at.isoformat(" "))
+            )
+        return client_key
+
+    def pending_for_user(self, user_id):
+        """Returns a user's unsynced (client_key, expense_type, amount, created_at) rows, oldest first."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT client_key, expense_type, amount, created_at FROM pending_expenses "
+                "WHERE user_id = ? ORDER BY rowid",
+                (user_id,)
+            ).fetchall()
+        return [
+            (client_key, expense_type, Money.parse(amount), datetime.fromisoformat(created_at))
+            for client_key, expense_type, amount, created_at in rows
+        ]
+
+    def count(self):
+        """Returns how many expenses are waiting to be sent."""
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM pending_expenses").fetchone()[0]
+
+    def flush(self, batch_size=BATCH_SIZE):
+        """Sends the oldest batch to the server; meant to run on a worker thread.
+
+        Returns ({client_key: server_id}, {user_id: expense_version}, [rejected
+        (client_key, user_id, expense_type, amount, created_at, error)]). When the
+        server refuses the data, the batch is retried one entry at a time so only
+        the bad entries are set aside. On any other failure the entries stay queued
+        with their attempt count bumped and the error is re-raised so the caller
+        can back off.
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT client_key, user_id, expense_type, amount, created_at FROM pending_expenses "
+                "ORDER BY rowid LIMIT ?",
+                (batch_size,)
+            ).fetchall()
+        if not rows:
+            return {}, {}, []
+
+        entries = [
+            (client_key, user_id, expense_type, Money.parse(amount), datetime.fromisoformat(created_at))
+            for client_key, user_id, expense_type, amount, created_at in rows
+        ]
+
+        try:
+            synced, versions = self._send(entries)
+            rejected = []
+        except Exception as e:
+            if not database.get_backend().is_rejection(e):
+                self._record_failure(entries, e)
+                raise
+            synced, versions, rejected = {}, {}, []
+            for entry in entries:
+                try:
+                    entry_synced, entry_versions = self._send([entry])
+                except Exception as entry_error:
+                    if not database.get_backend().is_rejection(entry_error):
+                        self._record_failure([entry], entry_error)
+                        if synced or rejected:
+                            break  # Report what got through; the next flush retries the rest
+                        raise
+                    self._reject(entry, entry_error)
+                    rejected.append(entry + (entry_error,))
+                else:
+                    synced.update(entry_synced)
+                    versions.update(entry_versions)
+        return synced, versions, rejected
+
+    def _send(self, entries):
+        """Stores entries on the server and drops them from the queue."""
+        synced, versions = database.apply_queued_expenses(entries)
+        with self._connect() as connection:
+            connection.executemany("DELETE FROM pending_expenses WHERE client_key = ?", [(entry[0],) for entry in entries])
+        return synced, versions
+
+    def _record_failure(self, entries, error):
+        with self._connect() as connection:
+            connection.executemany(
+                "UPDATE pending_expenses SET attempts = attempts + 1, last_error = ? WHERE client_key = ?",
+                [(str(error), entry[0]) for entry in entries]
+            )
+
+    def _reject(self, entry, error):
+        """Moves an entry the server refused from the queue to rejected_expenses."""
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO rejected_expenses "
+                "SELECT client_key, user_id, expense_type, amount, created_at, attempts + 1, ? "
+                "FROM pending_expenses WHERE client_key = ?",
+                (str(error), entry[0])
+            )
+            connection.execute("DELETE FROM pending_expenses WHERE client_key = ?", (entry[0],))